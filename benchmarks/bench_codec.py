@@ -0,0 +1,64 @@
+"""
+Compare the msgpack codec with JSON for plans and option lists.
+
+Reports encoded size and encode/decode time per 1k messages for:
+
+  json indent   model_dump + json.dumps(indent=2), the old --json output
+  json          model_dump_json / model_validate_json (TypeAdapter for lists)
+  msgpack       codec.dumps / codec.loads (lists go in their search-result envelopes)
+
+    python benchmarks/bench_codec.py --plans 1000 --repeat 5
+"""
+import argparse
+import json
+
+from bench_models import best_ms, build_plan
+
+from travel_planner.schemas import codec
+from travel_planner.schemas.models import (
+    FlightOption, FlightSearchResult, HotelOption, HotelSearchResult, TravelPlan, list_adapter
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--plans", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    plan = build_plan()
+    flights, hotels = plan.flight_options, plan.hotel_options
+    flights_result, hotels_result = FlightSearchResult(flights=flights), HotelSearchResult(hotels=hotels)
+    flights_adapter, hotels_adapter = list_adapter(FlightOption), list_adapter(HotelOption)
+
+    cases = [
+        ("plan: json indent",
+         lambda: json.dumps(plan.model_dump(mode="json"), indent=2).encode(),
+         lambda data: TravelPlan.model_validate(json.loads(data))),
+        ("plan: json",
+         lambda: plan.model_dump_json().encode(),
+         lambda data: TravelPlan.model_validate_json(data)),
+        ("plan: msgpack",
+         lambda: codec.dumps(plan),
+         lambda data: codec.loads(data, TravelPlan)),
+        ("options: json",
+         lambda: (flights_adapter.dump_json(flights), hotels_adapter.dump_json(hotels)),
+         lambda data: (flights_adapter.validate_json(data[0]), hotels_adapter.validate_json(data[1]))),
+        ("options: msgpack",
+         lambda: (codec.dumps(flights_result), codec.dumps(hotels_result)),
+         lambda data: (codec.loads(data[0], FlightSearchResult).flights,
+                       codec.loads(data[1], HotelSearchResult).hotels)),
+    ]
+
+    print(f"per {args.plans} plans (best of {args.repeat})")
+    print(f"{'':<20}{'bytes':>8}{'encode ms':>11}{'decode ms':>11}")
+    for name, encode, decode in cases:
+        data = encode()
+        size = len(data) if isinstance(data, bytes) else sum(map(len, data))
+        encode_ms = best_ms(encode, args.plans, args.repeat)
+        decode_ms = best_ms(lambda: decode(data), args.plans, args.repeat)
+        print(f"{name:<20}{size:>8}{encode_ms:>11.1f}{decode_ms:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
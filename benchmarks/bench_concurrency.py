@@ -0,0 +1,60 @@
+"""
+Check that the weather, flight and hotel sub-agents overlap inside one plan.
+
+With a non-blocking HTTP layer the plan should take roughly as long as the
+slowest sub-agent, not the sum of all of them.
+
+    python benchmarks/bench_concurrency.py --weather-latency 0.2 --llm-latency 0.5
+"""
+import argparse
+import asyncio
+import time
+
+from fakes import FakeUpstreams
+
+from travel_planner.agents.flight_agent import FlightAgent
+from travel_planner.agents.hotel_agent import HotelAgent
+from travel_planner.agents.travel_planner_agent import TravelPlannerAgent
+from travel_planner.agents.weather_agent import WeatherAgent
+from travel_planner.utils.http import close_http_client
+
+
+async def run(args) -> None:
+    fakes = FakeUpstreams(weather_latency=args.weather_latency, llm_latency=args.llm_latency)
+    fakes.install()
+    planner = TravelPlannerAgent(WeatherAgent(), FlightAgent(), HotelAgent())
+
+    timings = []
+    for i in range(args.iterations):
+        start = time.perf_counter()
+        plan = await planner.execute(f"Origin {i}", f"Destination {i}", "2030-01-01")
+        timings.append(time.perf_counter() - start)
+        assert all(s.status for s in plan.service_status.values()), plan.service_status
+
+    await close_http_client()
+
+    # Sequential cost of one plan: each agent's validation plus its main call
+    sequential = (
+        args.weather_latency                           # weather: one current.json call
+        + args.weather_latency + args.llm_latency      # flights: validation + LLM
+        + args.weather_latency + args.llm_latency      # hotels: validate + LLM
+    )
+    best = min(timings)
+    print(f"plans:                {args.iterations}")
+    print(f"best plan latency:    {best * 1000:.1f} ms")
+    print(f"mean plan latency:    {sum(timings) / len(timings) * 1000:.1f} ms")
+    print(f"sequential estimate:  {sequential * 1000:.1f} ms")
+    print(f"overlap factor:       {sequential / best:.2f}x")
+    print(f"upstream calls:       {dict(fakes.calls)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--weather-latency", type=float, default=0.1)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--iterations", type=int, default=5)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Compare separate flight/hotel completions with the fused single-call mode.
+
+Reports plan latency and prompt/completion tokens per plan for both modes.
+Latency grows with output length (--token-latency), as with real models.
+
+    python benchmarks/bench_fused.py --plans 20
+"""
+import argparse
+import asyncio
+import time
+
+from fakes import FakeUpstreams
+
+from travel_planner.agents.flight_agent import FlightAgent
+from travel_planner.agents.hotel_agent import HotelAgent
+from travel_planner.agents.travel_planner_agent import TravelPlannerAgent
+from travel_planner.utils.http import close_http_client
+
+
+async def measure(fused: bool, args) -> dict:
+    fakes = FakeUpstreams(
+        weather_latency=args.weather_latency,
+        llm_latency=args.llm_latency,
+        token_latency=args.token_latency
+    )
+    fakes.install()
+    planner = TravelPlannerAgent(None, FlightAgent(), HotelAgent())
+    planner.fused_search = fused
+
+    timings = []
+    for i in range(args.plans):
+        start = time.perf_counter()
+        # A new destination each time so no result is served from cache
+        plan = await planner.execute("Origin", f"{'Fused' if fused else 'Separate'} {i}", "2030-01-01")
+        timings.append(time.perf_counter() - start)
+        assert plan.service_status["flights"].status and plan.service_status["hotels"].status
+
+    return {
+        "latency_ms": sum(timings) / len(timings) * 1000,
+        "llm_calls": fakes.calls["openai"] / args.plans,
+        "prompt_tokens": fakes.tokens["prompt"] / args.plans,
+        "completion_tokens": fakes.tokens["completion"] / args.plans,
+    }
+
+
+async def run(args) -> None:
+    separate = await measure(False, args)
+    fused = await measure(True, args)
+    await close_http_client()
+
+    print(f"{'per plan':<20}{'separate':>12}{'fused':>12}{'change':>10}")
+    for metric in ("latency_ms", "llm_calls", "prompt_tokens", "completion_tokens"):
+        before, after = separate[metric], fused[metric]
+        change = (after - before) / before * 100 if before else 0.0
+        print(f"{metric:<20}{before:>12.1f}{after:>12.1f}{change:>9.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--plans", type=int, default=10)
+    parser.add_argument("--weather-latency", type=float, default=0.05)
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--token-latency", type=float, default=0.002)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Microbenchmark model construction and serialization, per 1k plans.
+
+Each "before" row is the per-item path the agents, cache and outputs used
+previously; each "after" row is the bulk pydantic-core path used now:
+
+  options   json.loads + one model per item  vs  one TypeAdapter/envelope validation
+  cache     json.loads + model_validate      vs  TypeAdapter.validate_json on the stored bytes
+  encode    model_dump + json.dumps           vs  model_dump_json / TypeAdapter.dump_json
+
+    python benchmarks/bench_models.py --plans 1000 --repeat 5
+"""
+import argparse
+import json
+import time
+from typing import Callable
+
+import fakes  # noqa: F401  (sets up the import path)
+from fakes import FLIGHTS, HOTELS
+
+from travel_planner.agents.flight_agent import FlightAgent
+from travel_planner.agents.hotel_agent import HotelAgent
+from travel_planner.schemas.models import (
+    BatchResult, FlightOption, HotelOption, ServiceStatus, TravelPlan, WeatherForecast, list_adapter
+)
+
+
+def best_ms(func: Callable[[], None], plans: int, repeat: int) -> float:
+    """Best-of-`repeat` wall time in ms for running func once per plan."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(plans):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def build_plan() -> TravelPlan:
+    return TravelPlan(
+        weather_forecast=WeatherForecast(temperature=18.5, condition="Partly cloudy", precipitation_chance=0.2),
+        flight_options=list_adapter(FlightOption).validate_python(FLIGHTS["flights"]),
+        hotel_options=list_adapter(HotelOption).validate_python(HOTELS["hotels"]),
+        service_status={s: ServiceStatus(status=True) for s in ("weather", "flights", "hotels")}
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--plans", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    flights_text, hotels_text = json.dumps(FLIGHTS), json.dumps(HOTELS)
+    flights_cached = json.dumps(FLIGHTS["flights"]).encode()
+    hotels_cached = json.dumps(HOTELS["hotels"]).encode()
+    plan = build_plan()
+    record = BatchResult(index=0, origin="London", destination="Paris", date="2030-01-01", plan=plan)
+
+    cases = [
+        ("options: flights+hotels",
+         lambda: ([FlightOption(**f) for f in json.loads(flights_text)["flights"]],
+                  [HotelOption.from_api_response(h) for h in json.loads(hotels_text)["hotels"]]),
+         lambda: (FlightAgent._from_data(json.loads(flights_text)),
+                  HotelAgent._from_data(json.loads(hotels_text)))),
+        ("cache read: flights+hotels",
+         lambda: ([FlightOption.model_validate(f) for f in json.loads(flights_cached)],
+                  [HotelOption.model_validate(h) for h in json.loads(hotels_cached)]),
+         lambda: (list_adapter(FlightOption).validate_json(flights_cached),
+                  list_adapter(HotelOption).validate_json(hotels_cached))),
+        ("cache write: flights+hotels",
+         lambda: (json.dumps([f.model_dump() for f in plan.flight_options]).encode(),
+                  json.dumps([h.model_dump() for h in plan.hotel_options]).encode()),
+         lambda: (list_adapter(FlightOption).dump_json(plan.flight_options),
+                  list_adapter(HotelOption).dump_json(plan.hotel_options))),
+        ("encode: plan",
+         lambda: json.dumps(plan.model_dump(mode="json")),
+         lambda: plan.model_dump_json()),
+        ("encode: batch line",
+         lambda: json.dumps({"index": 0, "origin": "London", "destination": "Paris",
+                             "date": "2030-01-01", "plan": plan.model_dump(mode="json")}),
+         lambda: record.to_json()),
+    ]
+
+    print(f"per {args.plans} plans (best of {args.repeat})")
+    print(f"{'':<28}{'before ms':>10}{'after ms':>10}{'change':>9}")
+    for name, before, after in cases:
+        before_ms = best_ms(before, args.plans, args.repeat)
+        after_ms = best_ms(after, args.plans, args.repeat)
+        print(f"{name:<28}{before_ms:>10.1f}{after_ms:>10.1f}{(after_ms - before_ms) / before_ms * 100:>8.1f}%")
+    print(f"{'build: plan':<28}{best_ms(build_plan, args.plans, args.repeat):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
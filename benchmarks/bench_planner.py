@@ -0,0 +1,140 @@
+"""
+Drive TravelPlannerAgent.execute at fixed concurrency against local fake servers.
+
+The fake WeatherAPI and OpenAI servers listen on a real port and the planner
+reaches them through its normal clients via WEATHER_API_BASE_URL and
+OPENAI_BASE_URL. For each concurrency level this reports throughput, latency
+percentiles, failed services and upstream calls per plan.
+
+    python benchmarks/bench_planner.py --concurrency 1 8 32 --requests 200 \\
+        --llm-latency lognormal:0.6:0.4 --llm-error-rate 0.02
+
+Pass --hedge to compare tail latency with hedged LLM requests.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import Counter
+
+from fake_servers import FakeServers
+
+from travel_planner.agents.flight_agent import FlightAgent
+from travel_planner.agents.hotel_agent import HotelAgent
+from travel_planner.agents.travel_planner_agent import TravelPlannerAgent
+from travel_planner.agents.weather_agent import WeatherAgent
+from travel_planner.config import get_settings
+from travel_planner.utils.http import close_http_client
+from travel_planner.utils.llm_gateway import close_llm_gateway, get_llm_gateway
+
+
+def percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+async def run_level(planner: TravelPlannerAgent, servers: FakeServers, concurrency: int, args) -> dict:
+    # A fresh route set per level keeps caches from carrying over between levels
+    routes = [(f"Origin {concurrency}-{i}", f"Destination {concurrency}-{i}") for i in range(args.routes)]
+    queue = iter(range(args.requests))
+    latencies = []
+    failures = Counter()
+    servers.reset()
+    before = get_llm_gateway().stats()
+
+    async def worker() -> None:
+        for i in queue:
+            origin, destination = routes[i % len(routes)]
+            start = time.perf_counter()
+            try:
+                plan = await planner.execute(origin, destination, args.date)
+            except Exception as e:
+                failures[type(e).__name__] += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+            for service, status in plan.service_status.items():
+                if not status.status:
+                    failures[service] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    after = get_llm_gateway().stats()
+
+    return {
+        "concurrency": concurrency,
+        "plans": len(latencies),
+        "seconds": round(elapsed, 3),
+        "throughput": round(len(latencies) / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 1),
+        "failures": dict(failures),
+        "upstream_calls": dict(servers.calls),
+        "calls_per_plan": round(
+            (servers.calls["weather"] + servers.calls["openai"]) / max(args.requests, 1), 2),
+        "hedges": after["hedges"] - before["hedges"],
+        "hedge_wins": after["hedge_wins"] - before["hedge_wins"],
+    }
+
+
+async def run(args, servers: FakeServers) -> list:
+    planner = TravelPlannerAgent(WeatherAgent(), FlightAgent(), HotelAgent())
+    results = []
+    try:
+        for concurrency in args.concurrency:
+            results.append(await run_level(planner, servers, concurrency, args))
+    finally:
+        await close_llm_gateway()
+        await close_http_client()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=100, help="Plans per concurrency level")
+    parser.add_argument("--routes", type=int, default=50, help="Distinct routes per level")
+    parser.add_argument("--date", default="2030-01-01")
+    parser.add_argument("--weather-latency", default="lognormal:0.08:0.3",
+                        help="fixed:S, uniform:A:B, lognormal:MEDIAN:SIGMA or exp:MEAN (seconds)")
+    parser.add_argument("--llm-latency", default="lognormal:0.5:0.4")
+    parser.add_argument("--weather-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--hedge", action="store_true", help="Enable hedged LLM requests")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    servers = FakeServers(
+        weather_latency=args.weather_latency,
+        llm_latency=args.llm_latency,
+        weather_error_rate=args.weather_error_rate,
+        llm_error_rate=args.llm_error_rate,
+        llm_rate_limit_rate=args.llm_rate_limit_rate,
+        seed=args.seed
+    ).start()
+    os.environ["WEATHER_API_BASE_URL"] = servers.weather_url
+    os.environ["OPENAI_BASE_URL"] = servers.openai_url
+    if args.hedge:
+        os.environ["LLM_HEDGING"] = "true"
+    get_settings.cache_clear()
+
+    try:
+        results = asyncio.run(run(args, servers))
+    finally:
+        servers.stop()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'conc':>5} {'plans':>6} {'plans/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'calls/plan':>10} {'hedges':>7}  failures")
+    for r in results:
+        print(f"{r['concurrency']:>5} {r['plans']:>6} {r['throughput']:>8} {r['p50_ms']:>8} "
+              f"{r['p95_ms']:>8} {r['p99_ms']:>8} {r['calls_per_plan']:>10} {r['hedges']:>7}  {r['failures'] or '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Fire a burst of identical plans at once and count upstream calls.
+
+With request coalescing, a burst of N identical searches should cost about
+as many upstream calls as a single search.
+
+    python benchmarks/bench_singleflight.py --burst 50
+"""
+import argparse
+import asyncio
+import time
+
+from fakes import FakeUpstreams
+
+from travel_planner.agents.flight_agent import FlightAgent
+from travel_planner.agents.hotel_agent import HotelAgent
+from travel_planner.agents.travel_planner_agent import TravelPlannerAgent
+from travel_planner.agents.weather_agent import WeatherAgent
+from travel_planner.utils.http import close_http_client
+from travel_planner.utils.singleflight import single_flight
+
+
+async def run(args) -> None:
+    fakes = FakeUpstreams(weather_latency=args.weather_latency, llm_latency=args.llm_latency)
+    fakes.install()
+    planner = TravelPlannerAgent(WeatherAgent(), FlightAgent(), HotelAgent())
+
+    start = time.perf_counter()
+    plans = await asyncio.gather(*[
+        planner.execute("San Francisco", "New York", "2030-01-01")
+        for _ in range(args.burst)
+    ])
+    elapsed = time.perf_counter() - start
+    await close_http_client()
+
+    ok = sum(all(s.status for s in plan.service_status.values()) for plan in plans)
+    print(f"burst size:        {args.burst} ({ok} succeeded)")
+    print(f"wall time:         {elapsed * 1000:.1f} ms")
+    print(f"upstream calls:    {dict(fakes.calls)}")
+    print(f"calls per plan:    {sum(fakes.calls.values()) / args.burst:.2f}")
+    for name in ("weather", "openai"):
+        print(f"{name + ' group:':<19}{single_flight(name).stats()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--burst", type=int, default=50)
+    parser.add_argument("--weather-latency", type=float, default=0.1)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Measure CLI startup cost with `python -X importtime` and enforce a budget.
+
+Runs `--help` and a weather-only plan (against a local fake WeatherAPI) in
+fresh interpreters, reports median wall time, total import time and the
+slowest imports, and exits non-zero if a run is over budget or loads a
+module it should not need (the OpenAI and AgentOps SDKs).
+
+    python benchmarks/bench_startup.py --runs 5 --help-budget 250 --weather-budget 1000
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from fake_servers import FakeServers
+
+SRC = str(Path(__file__).parent.parent / "src")
+
+# Neither scenario should pay for the LLM or telemetry SDKs
+FORBIDDEN = ("openai", "agentops")
+
+
+def parse_importtime(stderr: str) -> Tuple[float, Dict[str, float]]:
+    """Return total import time and the cumulative time of each module, in ms."""
+    total = 0.0
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        cumulative_ms = int(cumulative) / 1000
+        modules[name.strip()] = cumulative_ms
+        # Nested imports are indented further and already counted in their parent
+        if not name.startswith("  "):
+            total += cumulative_ms
+    return total, modules
+
+
+def run_once(args: List[str], env: Dict[str, str]) -> Tuple[float, float, Dict[str, float]]:
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "travel_planner", *args],
+        env=env, capture_output=True, text=True
+    )
+    wall = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"travel_planner {' '.join(args)} exited {result.returncode}:\n{result.stderr[-2000:]}")
+    total, modules = parse_importtime(result.stderr)
+    return wall, total, modules
+
+
+def measure(name: str, cli_args: List[str], env: Dict[str, str], runs: int, budget: float, top: int) -> bool:
+    walls, imports = [], []
+    modules = {}
+    for _ in range(runs):
+        wall, total, modules = run_once(cli_args, env)
+        walls.append(wall)
+        imports.append(total)
+
+    wall = statistics.median(walls)
+    loaded = sorted({m.split(".")[0] for m in modules} & set(FORBIDDEN))
+    ok = wall <= budget and not loaded
+    print(f"\n{name}: python -m travel_planner {' '.join(cli_args)}")
+    print(f"  wall time (median of {runs}):  {wall:8.1f} ms   budget {budget:g} ms")
+    print(f"  import time (median):       {statistics.median(imports):8.1f} ms")
+    print(f"  forbidden modules loaded:   {', '.join(loaded) or 'none'}")
+    roots = {m: t for m, t in modules.items() if "." not in m}
+    for module, ms in sorted(roots.items(), key=lambda item: -item[1])[:top]:
+        print(f"    {ms:8.1f} ms  {module}")
+    print(f"  {'OK' if ok else 'OVER BUDGET'}")
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--help-budget", type=float, default=250.0, help="Median wall time budget for --help, ms")
+    parser.add_argument("--weather-budget", type=float, default=1000.0,
+                        help="Median wall time budget for a weather-only run, ms")
+    parser.add_argument("--top", type=int, default=8, help="Slowest top-level imports to list")
+    args = parser.parse_args()
+
+    servers = FakeServers(weather_latency="0.01").start()
+    env = {
+        **os.environ,
+        "PYTHONPATH": SRC + os.pathsep + os.environ.get("PYTHONPATH", ""),
+        "WEATHER_API_BASE_URL": servers.weather_url,
+        "LLM_CACHE_PATH": "",
+    }
+    try:
+        results = [
+            measure("help", ["--help"], env, args.runs, args.help_budget, args.top),
+            measure("weather-only", ["-o", "London", "-d", "Paris", "--no-flights", "--no-hotels", "-q"],
+                    env, args.runs, args.weather_budget, args.top),
+        ]
+    finally:
+        servers.stop()
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    main()
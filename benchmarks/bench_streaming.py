@@ -0,0 +1,59 @@
+"""
+Compare time-to-first-option for streamed and buffered LLM completions.
+
+The buffered path waits for the whole completion before parsing; the
+streamed path yields each option as soon as its JSON object closes.
+
+    python benchmarks/bench_streaming.py --llm-latency 2.0
+"""
+import argparse
+import asyncio
+import time
+
+from fakes import FakeUpstreams
+
+from travel_planner.agents.flight_agent import FlightAgent
+from travel_planner.utils.http import close_http_client
+
+
+async def run(args) -> None:
+    fakes = FakeUpstreams(weather_latency=0.0, llm_latency=args.llm_latency)
+    fakes.install()
+    agent = FlightAgent()
+    # Measure the completion itself, not the result cache
+    agent.response_cache = None
+
+    buffered = []
+    for i in range(args.iterations):
+        start = time.perf_counter()
+        await agent.execute("Origin", f"Buffered {i}", "2030-01-01")
+        buffered.append(time.perf_counter() - start)
+
+    first, total = [], []
+    for i in range(args.iterations):
+        start = time.perf_counter()
+        arrivals = []
+        async for _ in agent.stream("Origin", f"Streamed {i}", "2030-01-01"):
+            arrivals.append(time.perf_counter() - start)
+        first.append(arrivals[0])
+        total.append(arrivals[-1])
+
+    await close_http_client()
+
+    def mean_ms(values):
+        return sum(values) / len(values) * 1000
+
+    print(f"buffered: first option {mean_ms(buffered):8.1f} ms, all options {mean_ms(buffered):8.1f} ms")
+    print(f"streamed: first option {mean_ms(first):8.1f} ms, all options {mean_ms(total):8.1f} ms")
+    print(f"time-to-first-option speedup: {mean_ms(buffered) / mean_ms(first):.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--llm-latency", type=float, default=1.0)
+    parser.add_argument("--iterations", type=int, default=3)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Compare the default JSON-object prompts with compact strict-schema prompts.
+
+Reports prompt and completion tokens per plan for both modes (the schema
+sent with structured requests counts as prompt tokens), then times parsing
+one flight and one hotel completion: json.loads plus per-item model
+construction against a single pydantic JSON validation. The fake OpenAI
+returns the same JSON in both modes, so completion tokens only differ
+against a real model.
+
+    python benchmarks/bench_structured.py --plans 10 --parse-iterations 20000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from fakes import FLIGHTS, HOTELS, FakeUpstreams
+
+from travel_planner.agents.flight_agent import FlightAgent
+from travel_planner.agents.hotel_agent import HotelAgent
+from travel_planner.agents.travel_planner_agent import TravelPlannerAgent
+from travel_planner.config import get_settings
+from travel_planner.schemas.models import FlightSearchResult, HotelSearchResult
+from travel_planner.utils.http import close_http_client
+from travel_planner.utils.structured_output import parse_structured
+
+
+async def measure(structured: bool, args) -> dict:
+    get_settings().llm_structured_output = structured
+    fakes = FakeUpstreams(weather_latency=args.weather_latency, llm_latency=args.llm_latency)
+    fakes.install()
+    planner = TravelPlannerAgent(None, FlightAgent(), HotelAgent())
+
+    for i in range(args.plans):
+        # A new destination each time so no result is served from cache
+        plan = await planner.execute("Origin", f"{'Structured' if structured else 'Default'} {i}", "2030-01-01")
+        assert plan.service_status["flights"].status and plan.service_status["hotels"].status
+
+    return {
+        "prompt_tokens": fakes.tokens["prompt"] / args.plans,
+        "completion_tokens": fakes.tokens["completion"] / args.plans,
+    }
+
+
+def time_parse(parse, content: str, iterations: int) -> float:
+    """Microseconds per call."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        parse(content)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def parse_times(iterations: int) -> dict:
+    flights, hotels = json.dumps(FLIGHTS), json.dumps(HOTELS)
+    return {
+        "flights_parse_us": (
+            time_parse(lambda c: FlightAgent._from_data(json.loads(c)), flights, iterations),
+            time_parse(lambda c: parse_structured(FlightSearchResult, c, FlightAgent._from_data), flights, iterations),
+        ),
+        "hotels_parse_us": (
+            time_parse(lambda c: HotelAgent._from_data(json.loads(c)), hotels, iterations),
+            time_parse(lambda c: parse_structured(HotelSearchResult, c, HotelAgent._from_data), hotels, iterations),
+        ),
+    }
+
+
+async def run(args) -> None:
+    default = await measure(False, args)
+    structured = await measure(True, args)
+    await close_http_client()
+
+    rows = {metric: (default[metric], structured[metric]) for metric in default}
+    rows.update(parse_times(args.parse_iterations))
+
+    print(f"{'per plan':<20}{'default':>12}{'structured':>12}{'change':>10}")
+    for metric, (before, after) in rows.items():
+        change = (after - before) / before * 100 if before else 0.0
+        print(f"{metric:<20}{before:>12.1f}{after:>12.1f}{change:>9.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--plans", type=int, default=10)
+    parser.add_argument("--parse-iterations", type=int, default=20000)
+    parser.add_argument("--weather-latency", type=float, default=0.01)
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Local HTTP stand-ins for WeatherAPI and OpenAI.
+
+Unlike the MockTransport fakes, these listen on a real socket, so the planner
+runs its normal clients end to end: point WEATHER_API_BASE_URL and
+OPENAI_BASE_URL at them. Latency is drawn from a seeded distribution and a
+configurable share of requests fail, so runs are reproducible.
+
+    python benchmarks/fake_servers.py --port 8900 --llm-latency lognormal:0.6:0.4
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import threading
+from collections import Counter
+from typing import Callable, Optional
+
+from aiohttp import web
+
+from fakes import completion_body, completion_content, stream_chunk, weather_payload
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Parse a latency distribution in seconds.
+
+    fixed:0.1, uniform:0.05:0.2, lognormal:<median>:<sigma> and exp:<mean>
+    are supported; a bare number means fixed.
+    """
+    kind, _, params = spec.partition(":")
+    if not params:
+        value = float(kind)
+        return lambda rng: value
+    args = [float(p) for p in params.split(":")]
+    if kind == "fixed":
+        return lambda rng: args[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(args[0], args[1])
+    if kind == "lognormal":
+        mu = math.log(args[0])
+        return lambda rng: rng.lognormvariate(mu, args[1])
+    if kind == "exp":
+        return lambda rng: rng.expovariate(1 / args[0])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+class FakeServers:
+    """
+    One aiohttp app serving both upstreams on its own event loop thread.
+
+    WeatherAPI lives under /weather/v1 and OpenAI under /openai/v1. Errors are
+    503 for WeatherAPI and 500 or 429 (with Retry-After) for OpenAI.
+    """
+
+    def __init__(
+        self,
+        weather_latency: str = "0.1",
+        llm_latency: str = "0.5",
+        weather_error_rate: float = 0.0,
+        llm_error_rate: float = 0.0,
+        llm_rate_limit_rate: float = 0.0,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0
+    ):
+        self.weather_latency = parse_latency(weather_latency)
+        self.llm_latency = parse_latency(llm_latency)
+        self.weather_error_rate = weather_error_rate
+        self.llm_error_rate = llm_error_rate
+        self.llm_rate_limit_rate = llm_rate_limit_rate
+        self.rng = random.Random(seed)
+        self.host = host
+        self.port = port
+        self.calls = Counter()
+        self.tokens = Counter()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def weather_url(self) -> str:
+        return f"http://{self.host}:{self.port}/weather/v1"
+
+    @property
+    def openai_url(self) -> str:
+        return f"http://{self.host}:{self.port}/openai/v1"
+
+    async def weather(self, request: web.Request) -> web.Response:
+        self.calls["weather"] += 1
+        await asyncio.sleep(self.weather_latency(self.rng))
+        if self.rng.random() < self.weather_error_rate:
+            self.calls["weather_errors"] += 1
+            return web.json_response({"error": {"message": "Service unavailable"}}, status=503)
+        status, payload = weather_payload(request.query.get("q", ""))
+        return web.json_response(payload, status=status)
+
+    async def openai(self, request: web.Request) -> web.StreamResponse:
+        self.calls["openai"] += 1
+        body = await request.json()
+        latency = self.llm_latency(self.rng)
+        roll = self.rng.random()
+        if roll < self.llm_rate_limit_rate:
+            self.calls["openai_rate_limited"] += 1
+            return web.json_response(
+                {"error": {"message": "Rate limit reached", "type": "requests"}},
+                status=429,
+                headers={"retry-after": "0.2"})
+        if roll < self.llm_rate_limit_rate + self.llm_error_rate:
+            await asyncio.sleep(latency)
+            self.calls["openai_errors"] += 1
+            return web.json_response({"error": {"message": "Internal error"}}, status=500)
+
+        text, prompt_tokens, completion_tokens = completion_content(body)
+        self.tokens["prompt"] += prompt_tokens
+        self.tokens["completion"] += completion_tokens
+
+        if not body.get("stream"):
+            await asyncio.sleep(latency)
+            return web.json_response(completion_body(body["model"], text, prompt_tokens, completion_tokens))
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        pieces = [text[i:i + 8] for i in range(0, len(text), 8)]
+        await asyncio.sleep(latency * 0.2)
+        try:
+            for piece in pieces:
+                await response.write(stream_chunk(body["model"], piece))
+                await asyncio.sleep(latency * 0.8 / len(pieces))
+            await response.write(b"data: [DONE]\n\n")
+            await response.write_eof()
+        except ConnectionResetError:
+            # The client closed the stream early, e.g. a cancelled hedge
+            self.calls["openai_abandoned"] += 1
+        return response
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/weather/v1/current.json", self.weather)
+        app.router.add_post("/openai/v1/chat/completions", self.openai)
+        return app
+
+    async def _serve(self) -> None:
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    def start(self) -> "FakeServers":
+        """Serve from a background thread so fake latency does not compete with the planner's loop."""
+        self._loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run() -> None:
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self._serve())
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="fake-upstreams", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self) -> None:
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    def reset(self) -> None:
+        self.calls.clear()
+        self.tokens.clear()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--weather-latency", default="0.1")
+    parser.add_argument("--llm-latency", default="0.5")
+    parser.add_argument("--weather-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    servers = FakeServers(
+        weather_latency=args.weather_latency,
+        llm_latency=args.llm_latency,
+        weather_error_rate=args.weather_error_rate,
+        llm_error_rate=args.llm_error_rate,
+        llm_rate_limit_rate=args.llm_rate_limit_rate,
+        seed=args.seed,
+        host=args.host,
+        port=args.port
+    ).start()
+    print(f"WEATHER_API_BASE_URL={servers.weather_url}")
+    print(f"OPENAI_BASE_URL={servers.openai_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        servers.stop()
+        print(json.dumps(dict(servers.calls)))
+
+
+if __name__ == "__main__":
+    main()
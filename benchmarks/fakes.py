@@ -0,0 +1,165 @@
+"""In-process stand-ins for WeatherAPI and OpenAI, served through httpx.MockTransport."""
+import asyncio
+import json
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+
+import httpx
+
+# Make the package importable without installation, as streamlit/app.py does
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+# Settings require API keys; benchmarks never reach the real services
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+os.environ.setdefault("WEATHER_API_KEY", "benchmark")
+os.environ.setdefault("AGENTOPS_API_KEY", "benchmark")
+# Keep runs independent of each other: cache LLM results in memory only
+os.environ.setdefault("LLM_CACHE_PATH", "")
+
+INVALID_CITIES = {"atlantis", "el dorado", "xyzzy"}
+
+FLIGHTS = {
+    "flights": [
+        {"departure_time": "06:15", "arrival_time": "14:40", "price": 289.0, "stops": 0},
+        {"departure_time": "11:05", "arrival_time": "21:30", "price": 214.5, "stops": 1},
+        {"departure_time": "21:50", "arrival_time": "06:05", "price": 179.0, "stops": 1},
+    ]
+}
+
+HOTELS = {
+    "hotels": [
+        {"name": "Harbor View Hotel", "rating": 4.5, "price_per_night": 310.0,
+         "location": "Waterfront", "amenities": ["wifi", "gym", "restaurant"]},
+        {"name": "Central Inn", "rating": 3.0, "price_per_night": 145.0,
+         "location": "Downtown", "amenities": ["wifi"]},
+    ]
+}
+
+
+def weather_payload(city: str):
+    """Return (status, body) for a current.json lookup of `city`."""
+    name = city.split(",")[0].strip()
+    if not name or name.lower() in INVALID_CITIES:
+        return 400, {"error": {"code": 1006, "message": "No matching location found."}}
+    return 200, {
+        "location": {"name": name.title(), "country": "Benchmarkland"},
+        "current": {"temp_c": 18.5, "condition": {"text": "Partly cloudy"}, "precip_mm": 0.2},
+    }
+
+
+def completion_content(body: dict):
+    """Return (text, prompt_tokens, completion_tokens) for a chat completion request."""
+    system_prompt = body["messages"][0]["content"].lower()
+    if "flight" in system_prompt and "hotel" in system_prompt:
+        content = {**FLIGHTS, **HOTELS}
+    else:
+        content = HOTELS if "hotel" in system_prompt else FLIGHTS
+    text = json.dumps(content)
+
+    # Roughly four characters per token; a JSON schema is billed as prompt too
+    prompt_chars = sum(len(m["content"]) for m in body["messages"])
+    if body.get("response_format", {}).get("type") == "json_schema":
+        prompt_chars += len(json.dumps(body["response_format"]["json_schema"]))
+    prompt_tokens = prompt_chars // 4
+    return text, prompt_tokens, len(text) // 4
+
+
+def completion_body(model: str, text: str, prompt_tokens: int, completion_tokens: int) -> dict:
+    return {
+        "id": "chatcmpl-benchmark",
+        "object": "chat.completion",
+        "created": 0,
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": text},
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def stream_chunk(model: str, piece: str) -> bytes:
+    chunk = {
+        "id": "chatcmpl-benchmark",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": model,
+        "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+    }
+    return f"data: {json.dumps(chunk)}\n\n".encode()
+
+
+class FakeUpstreams:
+    """
+    Mock WeatherAPI and OpenAI handlers with fixed per-call latency.
+
+    Call counts are recorded per endpoint so benchmarks can report upstream load.
+    """
+
+    def __init__(self, weather_latency: float = 0.1, llm_latency: float = 0.5, token_latency: float = 0.0):
+        self.weather_latency = weather_latency
+        self.llm_latency = llm_latency
+        # Extra generation time per completion token, so longer outputs take longer
+        self.token_latency = token_latency
+        self.calls = Counter()
+        self.tokens = Counter()
+
+    async def weather(self, request: httpx.Request) -> httpx.Response:
+        self.calls["weather"] += 1
+        await asyncio.sleep(self.weather_latency)
+        status, payload = weather_payload(request.url.params.get("q", ""))
+        return httpx.Response(status, json=payload)
+
+    async def openai(self, request: httpx.Request) -> httpx.Response:
+        self.calls["openai"] += 1
+        body = json.loads(request.content)
+        text, prompt_tokens, completion_tokens = completion_content(body)
+        self.tokens["prompt"] += prompt_tokens
+        self.tokens["completion"] += completion_tokens
+
+        if body.get("stream"):
+            return httpx.Response(
+                200,
+                headers={"content-type": "text/event-stream"},
+                content=self._stream_chunks(body["model"], text)
+            )
+
+        await asyncio.sleep(self.llm_latency + self.token_latency * completion_tokens)
+        return httpx.Response(200, json=completion_body(body["model"], text, prompt_tokens, completion_tokens))
+
+    async def _stream_chunks(self, model: str, text: str, chunk_size: int = 8):
+        """Emit the completion as SSE deltas: 20% of latency before the first token, the rest spread out."""
+        pieces = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+        await asyncio.sleep(self.llm_latency * 0.2)
+        for piece in pieces:
+            yield stream_chunk(model, piece)
+            await asyncio.sleep(self.llm_latency * 0.8 / len(pieces))
+        yield b"data: [DONE]\n\n"
+
+    def install(self) -> None:
+        """Route the shared WeatherAPI client and LLM gateway to these fakes; call inside the event loop."""
+        from travel_planner.utils.http import set_http_client
+        from travel_planner.utils.llm_gateway import get_llm_gateway
+
+        set_http_client(self.weather_client())
+        get_llm_gateway().client = self.openai_client()
+
+    def weather_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.weather))
+
+    def openai_client(self):
+        from openai import AsyncOpenAI
+
+        return AsyncOpenAI(
+            api_key="sk-benchmark",
+            max_retries=0,
+            base_url="http://fake-openai/v1",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(self.openai)),
+        )
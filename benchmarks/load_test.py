@@ -0,0 +1,294 @@
+"""
+Closed- and open-loop load generator and soak test for plan execution.
+
+Replays a query mix with Zipf-distributed destinations, varied dates and a
+share of invalid cities, either against TravelPlannerAgent in this process
+or against a running `python -m travel_planner serve`. Every --interval
+seconds it prints throughput and latency for that window alongside resource
+gauges: RSS, event-loop lag, open sockets and cache sizes. Growth that never
+levels off points at a leak. In-process runs start the local fake upstreams
+in the same process, so RSS and sockets include them. With --target, RSS, lag
+and sockets are the generator's own and server gauges come from /health.
+
+    # 10 minutes, 16 concurrent clients, in-process against local fake upstreams
+    python benchmarks/load_test.py --duration 600 --mode closed --concurrency 16
+
+    # Poisson arrivals at 20 plans/s against a server
+    python benchmarks/load_test.py --target http://127.0.0.1:8000 --mode open --rate 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from fake_servers import FakeServers
+from fakes import INVALID_CITIES
+
+CITIES = [
+    "London", "Paris", "New York", "Tokyo", "Rome", "Barcelona", "Amsterdam",
+    "Berlin", "Lisbon", "Dubai", "Singapore", "Bangkok", "Istanbul", "Prague",
+    "Vienna", "Sydney", "Los Angeles", "San Francisco", "Chicago", "Toronto",
+    "Madrid", "Athens", "Dublin", "Budapest", "Seoul", "Hong Kong", "Miami",
+    "Cape Town", "Mexico City", "Buenos Aires",
+]
+
+
+class QueryMix:
+    """Seeded query generator: Zipf destinations, uniform origins and dates, some invalid cities."""
+
+    def __init__(self, destinations: int, zipf_s: float, invalid_share: float, max_days: int, seed: int):
+        self.rng = random.Random(seed)
+        self.cities = CITIES + [f"City {i}" for i in range(len(CITIES), destinations)]
+        self.cities = self.cities[:destinations]
+        weights = [1 / (rank ** zipf_s) for rank in range(1, len(self.cities) + 1)]
+        total = sum(weights)
+        self.weights = [w / total for w in weights]
+        self.invalid_share = invalid_share
+        self.max_days = max_days
+        self.invalid = sorted(INVALID_CITIES)
+
+    def next(self) -> Dict[str, str]:
+        destination = self.rng.choices(self.cities, weights=self.weights)[0]
+        origin = self.rng.choice(self.cities)
+        if self.rng.random() < self.invalid_share:
+            destination = self.rng.choice(self.invalid).title()
+        date = datetime.now() + timedelta(days=self.rng.randint(1, self.max_days))
+        return {"origin": origin, "destination": destination, "date": date.strftime("%Y-%m-%d")}
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # Peak rather than current RSS where /proc is unavailable
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def open_sockets() -> Optional[int]:
+    try:
+        fds = os.listdir("/proc/self/fd")
+    except OSError:
+        return None
+    count = 0
+    for fd in fds:
+        try:
+            if os.readlink(f"/proc/self/fd/{fd}").startswith("socket:"):
+                count += 1
+        except OSError:
+            continue
+    return count
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+class LoadTest:
+    def __init__(self, args):
+        self.args = args
+        self.mix = QueryMix(args.destinations, args.zipf, args.invalid_share, args.max_days, args.seed)
+        self.latencies: List[float] = []
+        self.outcomes = Counter()
+        self.inflight = 0
+        self.max_lag = 0.0
+        self.samples: List[dict] = []
+        self.planner = None
+        self.session = None
+
+    async def plan(self, query: Dict[str, str]) -> str:
+        if self.session is not None:
+            async with self.session.get(f"{self.args.target}/plan", params=query) as response:
+                await response.read()
+                return "ok" if response.status == 200 else f"http_{response.status}"
+        plan = await self.planner.execute(query["origin"], query["destination"], query["date"])
+        failed = [s for s, status in plan.service_status.items() if not status.status]
+        return "ok" if not failed else "partial"
+
+    async def one(self) -> None:
+        query = self.mix.next()
+        self.inflight += 1
+        start = time.perf_counter()
+        try:
+            outcome = await self.plan(query)
+        except Exception as e:
+            outcome = type(e).__name__
+        finally:
+            self.inflight -= 1
+        self.latencies.append(time.perf_counter() - start)
+        self.outcomes[outcome] += 1
+
+    async def closed_loop(self, deadline: float) -> None:
+        async def client() -> None:
+            while time.monotonic() < deadline:
+                await self.one()
+        await asyncio.gather(*(client() for _ in range(self.args.concurrency)))
+
+    async def open_loop(self, deadline: float) -> None:
+        rng = random.Random(self.args.seed + 1)
+        tasks = set()
+        while time.monotonic() < deadline:
+            task = asyncio.ensure_future(self.one())
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            await asyncio.sleep(rng.expovariate(self.args.rate))
+        await asyncio.gather(*tasks)
+
+    async def watch_lag(self) -> None:
+        """Measure how late a short sleep wakes up; a blocked loop shows up as lag."""
+        interval = 0.05
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            self.max_lag = max(self.max_lag, time.perf_counter() - start - interval)
+
+    async def gauges(self) -> dict:
+        if self.session is not None:
+            async with self.session.get(f"{self.args.target}/health") as response:
+                health = await response.json()
+            return {
+                "server_inflight": health["admission"]["inflight"],
+                "server_rejected": health["admission"]["rejected"],
+                "llm_queue": health["llm_gateway"]["queue_depth"],
+            }
+
+        from travel_planner.utils.llm_cache import get_llm_cache
+        from travel_planner.utils.llm_gateway import get_llm_gateway
+        from travel_planner.utils.singleflight import single_flight
+        from travel_planner.utils.validators import get_city_cache
+
+        llm_cache = get_llm_cache()
+        return {
+            "city_cache": len(get_city_cache()),
+            "llm_cache": len(llm_cache.memory) if llm_cache is not None else 0,
+            "singleflight": len(single_flight("openai")._inflight) + len(single_flight("weather")._inflight),
+            "llm_queue": get_llm_gateway().queue_depth,
+        }
+
+    async def sample(self, started: float) -> None:
+        seen = 0
+        while True:
+            await asyncio.sleep(self.args.interval)
+            window = self.latencies[seen:]
+            seen = len(self.latencies)
+            sample = {
+                "t": round(time.monotonic() - started),
+                "done": seen,
+                "rps": round(len(window) / self.args.interval, 1),
+                "p50_ms": round(percentile(window, 0.50) * 1000),
+                "p95_ms": round(percentile(window, 0.95) * 1000),
+                "inflight": self.inflight,
+                "lag_ms": round(self.max_lag * 1000, 1),
+                "rss_mb": round(rss_mb(), 1),
+                "sockets": open_sockets(),
+                **(await self.gauges()),
+            }
+            self.max_lag = 0.0
+            self.samples.append(sample)
+            print(json.dumps(sample) if self.args.json else
+                  "  ".join(f"{k}={v}" for k, v in sample.items()), flush=True)
+
+    async def run(self) -> None:
+        if self.args.target:
+            import aiohttp
+            self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=120))
+        else:
+            from travel_planner.agents.flight_agent import FlightAgent
+            from travel_planner.agents.hotel_agent import HotelAgent
+            from travel_planner.agents.travel_planner_agent import TravelPlannerAgent
+            from travel_planner.agents.weather_agent import WeatherAgent
+            self.planner = TravelPlannerAgent(WeatherAgent(), FlightAgent(), HotelAgent())
+
+        started = time.monotonic()
+        background = [asyncio.ensure_future(self.watch_lag()), asyncio.ensure_future(self.sample(started))]
+        try:
+            deadline = started + self.args.duration
+            if self.args.mode == "closed":
+                await self.closed_loop(deadline)
+            else:
+                await self.open_loop(deadline)
+        finally:
+            for task in background:
+                task.cancel()
+            await asyncio.gather(*background, return_exceptions=True)
+            if self.session is not None:
+                await self.session.close()
+            else:
+                from travel_planner.utils.http import close_http_client
+                from travel_planner.utils.llm_gateway import close_llm_gateway
+                await close_llm_gateway()
+                await close_http_client()
+
+    def summary(self) -> dict:
+        summary = {
+            "plans": len(self.latencies),
+            "outcomes": dict(self.outcomes),
+            "p50_ms": round(percentile(self.latencies, 0.50) * 1000),
+            "p95_ms": round(percentile(self.latencies, 0.95) * 1000),
+            "p99_ms": round(percentile(self.latencies, 0.99) * 1000),
+        }
+        if len(self.samples) >= 2:
+            first, last = self.samples[0], self.samples[-1]
+            minutes = max((last["t"] - first["t"]) / 60, 1e-9)
+            summary["rss_growth_mb"] = round(last["rss_mb"] - first["rss_mb"], 1)
+            summary["rss_mb_per_min"] = round((last["rss_mb"] - first["rss_mb"]) / minutes, 2)
+            summary["max_lag_ms"] = max(s["lag_ms"] for s in self.samples)
+        return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", help="Base URL of a running server; default runs the planner in-process")
+    parser.add_argument("--mode", choices=["closed", "open"], default="closed")
+    parser.add_argument("--concurrency", type=int, default=16, help="Clients in closed-loop mode")
+    parser.add_argument("--rate", type=float, default=10.0, help="Mean arrivals per second in open-loop mode")
+    parser.add_argument("--duration", type=float, default=120.0, help="Seconds to run")
+    parser.add_argument("--interval", type=float, default=10.0, help="Seconds between samples")
+    parser.add_argument("--destinations", type=int, default=200, help="Distinct destinations in the mix")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent for destination popularity")
+    parser.add_argument("--invalid-share", type=float, default=0.05, help="Share of queries with an invalid city")
+    parser.add_argument("--max-days", type=int, default=90, help="Dates are 1..N days ahead")
+    parser.add_argument("--weather-latency", default="lognormal:0.08:0.3")
+    parser.add_argument("--llm-latency", default="lognormal:0.5:0.4")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print samples and summary as JSON lines")
+    args = parser.parse_args()
+
+    servers = None
+    if not args.target:
+        # In-process runs use local fake upstreams so a soak costs nothing
+        servers = FakeServers(
+            weather_latency=args.weather_latency,
+            llm_latency=args.llm_latency,
+            llm_error_rate=args.llm_error_rate,
+            seed=args.seed
+        ).start()
+        os.environ["WEATHER_API_BASE_URL"] = servers.weather_url
+        os.environ["OPENAI_BASE_URL"] = servers.openai_url
+
+    test = LoadTest(args)
+    try:
+        asyncio.run(test.run())
+    finally:
+        if servers is not None:
+            servers.stop()
+
+    summary = test.summary()
+    if servers is not None:
+        summary["upstream_calls"] = dict(servers.calls)
+    print(json.dumps(summary) if args.json else json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
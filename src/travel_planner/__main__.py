@@ -1,14 +1,13 @@
 import asyncio
 import argparse
+import sys
 from datetime import datetime, timedelta
 from colorama import init, Fore, Style
-from .agents.weather_agent import WeatherAgent
-from .agents.flight_agent import FlightAgent
-from .agents.hotel_agent import HotelAgent
-from .agents.travel_planner_agent import TravelPlannerAgent
-from .config import get_settings
-from .utils.logger import logger
 from .utils.exceptions import CityValidationError, ServiceError
+from .utils.dates import validate_travel_date
+
+# Agents, settings and the HTTP/OpenAI SDKs are imported inside main() and
+# only for the services a run uses, so --help and weather-only runs start fast
 
 # Initialize colorama
 init()
@@ -16,13 +15,7 @@ init()
 def validate_date(date_str: str) -> str:
     """Validate date format and ensure it's not in the past."""
     try:
-        date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        today = datetime.now().date()
-        if date < today:
-            raise ValueError("Date cannot be in the past")
-        if date > today + timedelta(days=365):
-            raise ValueError("Date cannot be more than 1 year in the future")
-        return date_str
+        return validate_travel_date(date_str)
     except ValueError as e:
         raise argparse.ArgumentTypeError(str(e))
 
@@ -37,6 +30,9 @@ Examples:
   python -m travel_planner -o "London" -d "Paris" -D 2024-12-01
   python -m travel_planner --origin "New York" --destination "Tokyo" --date 2024-12-25
   python -m travel_planner --no-weather --no-hotels  # Skip weather and hotel search
+  python -m travel_planner -o "London" -d "Paris" --date-from 2024-12-01 --date-to 2024-12-14
+  python -m travel_planner --batch routes.csv --concurrency 16 --output plans.jsonl
+  python -m travel_planner serve --port 8000  # Run as an HTTP service
         """
     )
     
@@ -58,6 +54,18 @@ Examples:
         default=(datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d"),
         help="Travel date in YYYY-MM-DD format (default: 7 days from today)"
     )
+
+    parser.add_argument(
+        "--date-from",
+        type=validate_date,
+        help="First day of a date-range search (YYYY-MM-DD); use with --date-to"
+    )
+
+    parser.add_argument(
+        "--date-to",
+        type=validate_date,
+        help="Last day of a date-range search (YYYY-MM-DD); days are ranked by price"
+    )
     
     parser.add_argument(
         "--no-weather",
@@ -77,6 +85,18 @@ Examples:
         help="Skip hotel search"
     )
     
+    parser.add_argument(
+        "--stream-options",
+        action="store_true",
+        help="Show flight and hotel options as soon as each one is generated"
+    )
+    
+    parser.add_argument(
+        "--fused",
+        action="store_true",
+        help="Generate flights and hotels with one LLM call instead of two"
+    )
+    
     parser.add_argument(
         "-q", "--quiet",
         action="store_true",
@@ -89,8 +109,75 @@ Examples:
         help="Output in JSON format"
     )
 
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Include a per-stage timing breakdown (added to the JSON output with --json)"
+    )
+
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="Plan every query in a CSV or JSONL file ('-' for stdin) and write JSONL results"
+    )
+
+    parser.add_argument(
+        "--input-format",
+        choices=["csv", "jsonl"],
+        help="Batch input format (default: from file extension, JSONL for stdin)"
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Maximum number of plans run at once in batch mode (default: 8)"
+    )
+
+    parser.add_argument(
+        "--output",
+        metavar="FILE",
+        help="Write batch results to FILE instead of stdout"
+    )
+
+    parser.add_argument(
+        "--output-format",
+        choices=["jsonl", "msgpack"],
+        default="jsonl",
+        help="Batch output format: JSONL lines or compact binary msgpack messages (default: jsonl)"
+    )
+
     return parser
 
+def print_calendar(range_plan):
+    """Print a date-range search as a calendar, marking the cheapest day."""
+    print(f"\n{Fore.CYAN}=== Prices by Date ==={Style.RESET_ALL}")
+    print(f"{'Date':<12} {'Flight':>9} {'Hotel/night':>12} {'Total':>9} {'Rank':>5}")
+    for day in range_plan.dates:
+        flight = f"${day.cheapest_flight.price:,.0f}" if day.cheapest_flight else "-"
+        hotel = f"${day.cheapest_hotel.price_per_night:,.0f}" if day.cheapest_hotel else "-"
+        total = f"${day.total_price:,.0f}" if day.total_price is not None else "-"
+        rank = str(day.rank) if day.rank is not None else "-"
+        color = Fore.GREEN if day.rank == 1 else ""
+        print(f"{color}{day.date:<12} {flight:>9} {hotel:>12} {total:>9} {rank:>5}{Style.RESET_ALL}")
+        failed = [f"{service}: {status.error}" for service, status in day.service_status.items() if not status.status]
+        if failed:
+            print(f"{Fore.RED}  {'; '.join(failed)}{Style.RESET_ALL}")
+
+    ranked = range_plan.ranked()
+    if ranked:
+        best = ranked[0]
+        print(f"\nCheapest day: {Fore.YELLOW}{best.date}{Style.RESET_ALL} "
+              f"(${best.total_price:,.2f})")
+    else:
+        print(f"\n{Fore.YELLOW}No prices found in this date range{Style.RESET_ALL}")
+
+def print_timings(timings):
+    """Print the per-stage timing breakdown of a plan."""
+    print(f"\n{Fore.CYAN}=== Timings ==={Style.RESET_ALL}")
+    for stage, entry in sorted(timings.items(), key=lambda item: -item[1]["total_ms"]):
+        print(f"{stage:<20} {entry['total_ms']:>9.1f} ms  ({entry['count']}x)")
+
 def print_weather(weather_forecast):
     """Print weather information with formatting."""
     print(f"\n{Fore.CYAN}=== Current Weather ==={Style.RESET_ALL}")
@@ -98,6 +185,14 @@ def print_weather(weather_forecast):
     print(f"Condition: {Fore.YELLOW}{weather_forecast.condition}{Style.RESET_ALL}")
     print(f"Precipitation: {Fore.YELLOW}{weather_forecast.precipitation_chance}mm{Style.RESET_ALL}")
 
+def print_flight(i, flight):
+    """Print one flight option with formatting."""
+    print(f"\n{Fore.GREEN}Flight Option {i}:{Style.RESET_ALL}")
+    print(f"Departure: {Fore.YELLOW}{flight.departure_time}{Style.RESET_ALL}")
+    print(f"Arrival: {Fore.YELLOW}{flight.arrival_time}{Style.RESET_ALL}")
+    print(f"Price: {Fore.YELLOW}${flight.price}{Style.RESET_ALL}")
+    print(f"Stops: {Fore.YELLOW}{flight.stops}{Style.RESET_ALL}")
+
 def print_flights(flight_options):
     """Print flight information with formatting."""
     if not flight_options:
@@ -106,11 +201,16 @@ def print_flights(flight_options):
 
     print(f"\n{Fore.CYAN}=== Flight Options ==={Style.RESET_ALL}")
     for i, flight in enumerate(flight_options, 1):
-        print(f"\n{Fore.GREEN}Flight Option {i}:{Style.RESET_ALL}")
-        print(f"Departure: {Fore.YELLOW}{flight.departure_time}{Style.RESET_ALL}")
-        print(f"Arrival: {Fore.YELLOW}{flight.arrival_time}{Style.RESET_ALL}")
-        print(f"Price: {Fore.YELLOW}${flight.price}{Style.RESET_ALL}")
-        print(f"Stops: {Fore.YELLOW}{flight.stops}{Style.RESET_ALL}")
+        print_flight(i, flight)
+
+def print_hotel(i, hotel):
+    """Print one hotel option with formatting."""
+    print(f"\n{Fore.GREEN}Hotel Option {i}:{Style.RESET_ALL}")
+    print(f"Name: {Fore.YELLOW}{hotel.name}{Style.RESET_ALL}")
+    print(f"Rating: {Fore.YELLOW}{'⭐' * int(hotel.rating)}{Style.RESET_ALL}")
+    print(f"Price per night: {Fore.YELLOW}${hotel.price_per_night}{Style.RESET_ALL}")
+    print(f"Location: {Fore.YELLOW}{hotel.location}{Style.RESET_ALL}")
+    print(f"Amenities: {Fore.YELLOW}{', '.join(hotel.amenities)}{Style.RESET_ALL}")
 
 def print_hotels(hotel_options):
     """Print hotel information with formatting."""
@@ -120,27 +220,63 @@ def print_hotels(hotel_options):
 
     print(f"\n{Fore.CYAN}=== Hotel Options ==={Style.RESET_ALL}")
     for i, hotel in enumerate(hotel_options, 1):
-        print(f"\n{Fore.GREEN}Hotel Option {i}:{Style.RESET_ALL}")
-        print(f"Name: {Fore.YELLOW}{hotel.name}{Style.RESET_ALL}")
-        print(f"Rating: {Fore.YELLOW}{'⭐' * int(hotel.rating)}{Style.RESET_ALL}")
-        print(f"Price per night: {Fore.YELLOW}${hotel.price_per_night}{Style.RESET_ALL}")
-        print(f"Location: {Fore.YELLOW}{hotel.location}{Style.RESET_ALL}")
-        print(f"Amenities: {Fore.YELLOW}{', '.join(hotel.amenities)}{Style.RESET_ALL}")
+        print_hotel(i, hotel)
+
+def print_partial_update(update, shown):
+    """Print options streamed before their service has finished."""
+    if update.service == "flights":
+        title, options, printer = "Flight Options", update.flight_options, print_flight
+    else:
+        title, options, printer = "Hotel Options", update.hotel_options, print_hotel
+
+    if not shown.get(update.service):
+        print(f"\n{Fore.CYAN}=== {title} ==={Style.RESET_ALL}")
+    for option in options:
+        shown[update.service] = shown.get(update.service, 0) + 1
+        printer(shown[update.service], option)
+
+def print_service_update(update, shown):
+    """Print one service's result as soon as it arrives."""
+    if update.partial:
+        print_partial_update(update, shown)
+    elif not update.status.status:
+        print(f"{Fore.RED}⚠️ {update.service.title()} service error: {update.status.error}{Style.RESET_ALL}")
+    elif shown.get(update.service):
+        return  # Options were already printed as they streamed in
+    elif update.service == "weather":
+        print_weather(update.weather_forecast)
+    elif update.service == "flights":
+        print_flights(update.flight_options)
+    elif update.service == "hotels":
+        print_hotels(update.hotel_options)
 
 async def main():
     parser = setup_argparse()
     args = parser.parse_args()
-    
+    if bool(args.date_from) != bool(args.date_to):
+        parser.error("--date-from and --date-to must be used together")
+    if args.date_from and args.date_to < args.date_from:
+        parser.error("--date-to cannot be before --date-from")
+
+    from .agents.travel_planner_agent import TravelPlannerAgent
+    from .config import get_settings
+    from .schemas.models import PlanCompleted
+    from .utils.logger import logger
+    from .utils.metrics import collect_timings
+
+    agents = {}
     try:
         settings = get_settings()
         
         # Initialize only required agents
-        agents = {}
         if not args.no_weather:
+            from .agents.weather_agent import WeatherAgent
             agents['weather'] = WeatherAgent()
         if not args.no_flights:
+            from .agents.flight_agent import FlightAgent
             agents['flight'] = FlightAgent()
         if not args.no_hotels:
+            from .agents.hotel_agent import HotelAgent
             agents['hotel'] = HotelAgent()
         
         # Initialize travel planner with available agents
@@ -149,6 +285,57 @@ async def main():
             flight_agent=agents.get('flight'),
             hotel_agent=agents.get('hotel')
         )
+        if args.stream_options:
+            travel_planner.stream_options = True
+        if args.fused:
+            travel_planner.fused_search = True
+
+        if args.batch:
+            from .batch import read_queries, run_batch
+            queries = read_queries(args.batch, args.input_format)
+            for query in queries:
+                query["date"] = query["date"] or args.date
+            if args.output_format == "msgpack":
+                output = open(args.output, "wb") if args.output else sys.stdout.buffer
+            else:
+                output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+            try:
+                failures = await run_batch(
+                    travel_planner,
+                    queries,
+                    output,
+                    concurrency=args.concurrency,
+                    validate_date=validate_date,
+                    output_format=args.output_format
+                )
+            finally:
+                if output not in (sys.stdout, sys.stdout.buffer):
+                    output.close()
+            return 1 if failures else 0
+
+        if args.date_from:
+            if not args.quiet and not args.json:
+                print(f"\n{Fore.CYAN}Searching {args.date_from} to {args.date_to}...{Style.RESET_ALL}")
+            with collect_timings() as timings:
+                range_plan = await travel_planner.execute_range(
+                    origin=args.origin,
+                    destination=args.destination,
+                    date_from=args.date_from,
+                    date_to=args.date_to
+                )
+            if args.json:
+                import json
+                output = range_plan.model_dump(mode="json")
+                if args.timings:
+                    output["timings"] = timings
+                print(json.dumps(output, indent=2))
+                return 0
+            if not args.no_weather and range_plan.weather_status.status:
+                print_weather(range_plan.weather_forecast)
+            print_calendar(range_plan)
+            if args.timings:
+                print_timings(timings)
+            return 0
         
         if not args.quiet:
             print(f"\n{Fore.CYAN}Searching travel options...{Style.RESET_ALL}")
@@ -156,32 +343,37 @@ async def main():
             print(f"To: {Fore.YELLOW}{args.destination}{Style.RESET_ALL}")
             print(f"Date: {Fore.YELLOW}{args.date}{Style.RESET_ALL}\n")
         
-        # Plan a trip
-        plan = await travel_planner.execute(
-            origin=args.origin,
-            destination=args.destination,
-            date=args.date
-        )
-        
         if args.json:
+            with collect_timings() as timings:
+                plan = await travel_planner.execute(
+                    origin=args.origin,
+                    destination=args.destination,
+                    date=args.date
+                )
+            if not args.timings:
+                print(plan.model_dump_json(indent=2))
+                return
             import json
-            print(json.dumps(plan.dict(), indent=2, default=str))
+            output = plan.model_dump(mode="json")
+            output["timings"] = timings
+            print(json.dumps(output, indent=2))
             return
         
-        # Display results based on service availability and user preferences
-        if not args.quiet:
-            for service, status in plan.service_status.items():
-                if not status.status:
-                    print(f"{Fore.RED}⚠️ {service.title()} service error: {status.error}{Style.RESET_ALL}")
-            
-            if not args.no_weather and plan.service_status["weather"].status:
-                print_weather(plan.weather_forecast)
-            
-            if not args.no_flights and plan.service_status["flights"].status:
-                print_flights(plan.flight_options)
-            
-            if not args.no_hotels and plan.service_status["hotels"].status:
-                print_hotels(plan.hotel_options)
+        # Plan a trip, displaying each service's results as they arrive
+        plan = None
+        shown = {}
+        with collect_timings() as timings:
+            async for event in travel_planner.stream(
+                origin=args.origin,
+                destination=args.destination,
+                date=args.date
+            ):
+                if isinstance(event, PlanCompleted):
+                    plan = event.plan
+                elif not args.quiet:
+                    print_service_update(event, shown)
+        if args.timings:
+            print_timings(timings)
         
         logger.info("trip_planning_completed",
                    origin=args.origin,
@@ -204,10 +396,22 @@ async def main():
         print(f"\n{Fore.RED}An unexpected error occurred: {str(e)}{Style.RESET_ALL}")
         logger.error("main_error", error=str(e))
         return 1
+
+    finally:
+        if 'flight' in agents or 'hotel' in agents:
+            from .utils.llm_gateway import close_llm_gateway
+            await close_llm_gateway()
+        if agents:
+            from .utils.http import close_http_client
+            await close_http_client()
     
     return 0
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        from .server import main as serve
+        exit(serve(sys.argv[2:]))
+
     try:
         exit_code = asyncio.run(main())
         exit(exit_code)
@@ -0,0 +1,141 @@
+import asyncio
+from .base import BaseAgent
+from typing import List, Tuple
+from ..schemas.models import CombinedSearchResult, FlightOption, HotelOption, list_adapter
+from ..config import get_settings
+from ..utils.llm_cache import get_llm_cache
+from ..utils.llm_gateway import LLMGateway, get_llm_gateway
+from ..utils.logger import logger
+from ..utils.metrics import get_metrics
+from ..utils.singleflight import single_flight, request_key
+from ..utils.structured_output import parse_structured, structured_request
+from ..utils.validators import CityValidator
+import json
+from ..utils.monitoring import track_agent, record_action
+
+
+@track_agent(name="CombinedSearchAgent")
+class CombinedSearchAgent(BaseAgent):
+    """
+    Generates flight and hotel options with a single completion.
+
+    Used by TravelPlannerAgent's fused mode to send one system prompt per
+    plan instead of two; results are split into the usual option models.
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.city_validator = CityValidator(self.settings.weather_api_key)
+        self.response_cache = get_llm_cache()
+
+    @property
+    def gateway(self) -> LLMGateway:
+        # Looked up per call: the shared gateway is rebuilt when the event loop changes
+        return get_llm_gateway()
+
+    async def _build_request(self, origin: str, destination: str, date: str) -> dict:
+        """Validate both cities and build one completion request for flights and hotels."""
+        (origin_valid, origin_msg), (dest_valid, dest_msg) = await asyncio.gather(
+            self.city_validator.validate_city(origin),
+            self.city_validator.validate_city(destination)
+        )
+
+        if not origin_valid or not dest_valid:
+            error_msg = []
+            if not origin_valid:
+                error_msg.append(f"Invalid origin city: {origin}")
+            if not dest_valid:
+                error_msg.append(
+                    f"Invalid destination city: {destination}")
+            raise ValueError(" && ".join(error_msg))
+
+        if self.settings.llm_structured_output:
+            return structured_request(
+                CombinedSearchResult,
+                f"You are a travel search assistant. Give up to {self.settings.llm_max_options} realistic flights "
+                f"and up to {self.settings.llm_max_options} hotels: flight durations, stops and prices fit the route "
+                "and time of day; hotel prices fit the city's cost of living, ratings vary and match the amenities, "
+                "locations are real areas of the city. Times are HH:MM, ratings 1-5, prices in USD.",
+                f"Flights from {origin_msg} to {dest_msg} on {date} and hotels in {dest_msg} for that night. "
+                "Empty list for any part that is not realistic."
+            )
+
+        system_prompt = """You are a travel search assistant.
+        IMPORTANT: Generate realistic options based on these rules:
+        1. Flight durations, stops and prices should be realistic for the route and time of day
+        2. Early morning and late evening flights are more common
+        3. Hotel prices should reflect the city's cost of living
+        4. Hotel ratings should be realistic (not all hotels are 5-star) and match their amenities
+        5. Hotel locations should be specific areas of the destination city
+        
+        Provide options in JSON format with the following structure:
+        {
+            "flights": [
+                {"departure_time": "HH:MM", "arrival_time": "HH:MM", "price": float, "stops": integer}
+            ],
+            "hotels": [
+                {"name": "Hotel Name", "rating": float (1-5), "price_per_night": float,
+                 "location": "area in city", "amenities": ["amenity1", "amenity2", ...]}
+            ]
+        }"""
+
+        return dict(
+            model=self.settings.openai_model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": f"Find flights from {origin_msg} to {dest_msg} on {date} and hotels in {dest_msg} for that night. Use an empty array for any part that is not realistic."}
+            ],
+            response_format={"type": "json_object"}
+        )
+
+    @staticmethod
+    def _from_data(data: dict) -> CombinedSearchResult:
+        return CombinedSearchResult(
+            flights=list_adapter(FlightOption).validate_python(data.get("flights") or []),
+            hotels=HotelOption.list_from_api_response(data.get("hotels") or [])
+        )
+
+    def _parse(self, content: str) -> CombinedSearchResult:
+        """Turn completion text into flight and hotel options."""
+        metrics = get_metrics()
+        if self.settings.llm_structured_output:
+            # The schema already fixed the shape, so validate in one pass
+            with metrics.timer("structured_parse"):
+                return parse_structured(CombinedSearchResult, content, self._from_data)
+        with metrics.timer("json_parse"):
+            data = json.loads(content)
+        with metrics.timer("model_build"):
+            return self._from_data(data)
+
+    @record_action("execute")
+    async def execute(self, origin: str, destination: str, date: str) -> Tuple[List[FlightOption], List[HotelOption]]:
+        try:
+            request = await self._build_request(origin, destination, date)
+
+            cache_key = request_key(request)
+            if self.response_cache is not None:
+                flights = await self.response_cache.get(f"{cache_key}:flights", FlightOption)
+                hotels = await self.response_cache.get(f"{cache_key}:hotels", HotelOption)
+                if flights is not None and hotels is not None:
+                    logger.info("combined_cache_hit", flights=len(flights), hotels=len(hotels))
+                    return flights, hotels
+
+            response = await single_flight("openai").do(
+                cache_key,
+                lambda: self.gateway.complete(**request)
+            )
+
+            result = self._parse(response.choices[0].message.content)
+            flights, hotels = result.flights, result.hotels
+
+            if self.response_cache is not None:
+                await self.response_cache.set(
+                    f"{cache_key}:flights", flights, ttl=self.settings.flight_cache_ttl)
+                await self.response_cache.set(
+                    f"{cache_key}:hotels", hotels, ttl=self.settings.hotel_cache_ttl)
+
+            return flights, hotels
+
+        except Exception as e:
+            logger.error("combined_search_error", error=str(e))
+            raise
@@ -1,78 +1,190 @@
+import asyncio
+import time
 from .base import BaseAgent
-from openai import AsyncOpenAI
-from typing import List
-from ..schemas.models import FlightOption
+from typing import AsyncIterator, List
+from ..schemas.models import FlightOption, FlightSearchResult
 from ..config import get_settings
+from ..utils.json_stream import JSONArrayStreamParser
+from ..utils.llm_cache import get_llm_cache
+from ..utils.llm_gateway import LLMGateway, get_llm_gateway
 from ..utils.logger import logger
+from ..utils.metrics import get_metrics
+from ..utils.singleflight import single_flight, request_key
+from ..utils.structured_output import parse_structured, structured_request
 from ..utils.validators import CityValidator
 import json
-from agentops import track_agent, record_tool
+from ..utils.monitoring import track_agent, record_action
 
 
 @track_agent(name="FlightAgent")
 class FlightAgent(BaseAgent):
     def __init__(self):
         self.settings = get_settings()
-        self.client = AsyncOpenAI(api_key=self.settings.openai_api_key)
         self.city_validator = CityValidator(self.settings.weather_api_key)
+        self.response_cache = get_llm_cache()
 
-    @record_tool(tool_name="execute")
+    @property
+    def gateway(self) -> LLMGateway:
+        # Looked up per call: the shared gateway is rebuilt when the event loop changes
+        return get_llm_gateway()
+
+    async def _build_request(self, origin: str, destination: str, date: str) -> dict:
+        """Validate both cities and build the completion request for the route."""
+        # Validate cities first
+        (origin_valid, origin_msg), (dest_valid, dest_msg) = await asyncio.gather(
+            self.city_validator.validate_city(origin),
+            self.city_validator.validate_city(destination)
+        )
+
+        if not origin_valid or not dest_valid:
+            error_msg = []
+            if not origin_valid:
+                error_msg.append(f"Invalid origin city: {origin}")
+            if not dest_valid:
+                error_msg.append(
+                    f"Invalid destination city: {destination}")
+            raise ValueError(" && ".join(error_msg))
+
+        # Use validated city names
+        origin = origin_msg
+        destination = dest_msg
+
+        if self.settings.llm_structured_output:
+            return structured_request(
+                FlightSearchResult,
+                f"You are a flight search assistant. Give up to {self.settings.llm_max_options} realistic flights: "
+                "durations, stops and prices fit the distance and time of day; early morning and late evening "
+                "departures are more common. Times are HH:MM, prices in USD.",
+                f"Flights from {origin} to {destination} on {date}. Empty list if the route is not realistic."
+            )
+
+        system_prompt = """You are a flight search assistant. 
+        IMPORTANT: Generate realistic flight options based on these rules:
+        1. Flight durations should be realistic based on distance
+        2. Prices should be realistic for the route
+        3. Number of stops should make sense for the distance
+        4. Early morning and late evening flights are more common
+        5. Prices should vary based on time of day
+        
+        Provide flight options in JSON format with the following structure:
+        {
+            "flights": [
+                {
+                    "departure_time": "HH:MM",
+                    "arrival_time": "HH:MM",
+                    "price": float,
+                    "stops": integer
+                }
+            ]
+        }"""
+
+        return dict(
+            model=self.settings.openai_model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": f"Find flights from {origin} to {destination} on {date}. If this route is not realistic or cities are too small for direct flights, respond with empty flights array."}
+            ],
+            response_format={"type": "json_object"}
+        )
+
+    @staticmethod
+    def _from_data(data: dict) -> FlightSearchResult:
+        return FlightSearchResult.model_validate({"flights": data.get("flights") or []})
+
+    def _parse(self, content: str) -> List[FlightOption]:
+        """Turn completion text into flight options."""
+        metrics = get_metrics()
+        if self.settings.llm_structured_output:
+            # The schema already fixed the shape, so validate in one pass
+            with metrics.timer("structured_parse"):
+                return parse_structured(FlightSearchResult, content, self._from_data).flights
+        with metrics.timer("json_parse"):
+            flight_data = json.loads(content)
+        with metrics.timer("model_build"):
+            return self._from_data(flight_data).flights
+
+    @record_action("execute")
     async def execute(self, origin: str, destination: str, date: str) -> List[FlightOption]:
         try:
-            # Validate cities first
-            origin_valid, origin_msg = await self.city_validator.validate_city(origin)
-            dest_valid, dest_msg = await self.city_validator.validate_city(destination)
-
-            if not origin_valid or not dest_valid:
-                error_msg = []
-                if not origin_valid:
-                    error_msg.append(f"Invalid origin city: {origin}")
-                if not dest_valid:
-                    error_msg.append(
-                        f"Invalid destination city: {destination}")
-                raise ValueError(" && ".join(error_msg))
-
-            # Use validated city names
-            origin = origin_msg
-            destination = dest_msg
-
-            system_prompt = """You are a flight search assistant. 
-            IMPORTANT: Generate realistic flight options based on these rules:
-            1. Flight durations should be realistic based on distance
-            2. Prices should be realistic for the route
-            3. Number of stops should make sense for the distance
-            4. Early morning and late evening flights are more common
-            5. Prices should vary based on time of day
-            
-            Provide flight options in JSON format with the following structure:
-            {
-                "flights": [
-                    {
-                        "departure_time": "HH:MM",
-                        "arrival_time": "HH:MM",
-                        "price": float,
-                        "stops": integer
-                    }
-                ]
-            }"""
-
-            response = await self.client.chat.completions.create(
-                model=self.settings.openai_model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Find flights from {origin} to {destination} on {date}. If this route is not realistic or cities are too small for direct flights, respond with empty flights array."}
-                ],
-                response_format={"type": "json_object"}
+            request = await self._build_request(origin, destination, date)
+
+            # Repeated searches are served from the parsed-result cache
+            cache_key = request_key(request)
+            if self.response_cache is not None:
+                cached = await self.response_cache.get(cache_key, FlightOption)
+                if cached is not None:
+                    logger.info("flight_cache_hit", count=len(cached))
+                    return cached
+
+            # Identical concurrent searches share one completion
+            response = await single_flight("openai").do(
+                cache_key,
+                lambda: self.gateway.complete(**request)
             )
 
-            flight_data = json.loads(response.choices[0].message.content)
+            flights = self._parse(response.choices[0].message.content)
+
+            if not flights:
+                logger.info(f"No flights found for route: {origin} to {destination}")
+
+            if self.response_cache is not None:
+                await self.response_cache.set(
+                    cache_key, flights, ttl=self.settings.flight_cache_ttl)
+
+            return flights
+
+        except Exception as e:
+            logger.error("flight_search_error", error=str(e))
+            raise
+
+    async def stream(self, origin: str, destination: str, date: str) -> AsyncIterator[FlightOption]:
+        """
+        Yield each FlightOption as soon as its JSON object is complete.
+
+        Uses a streaming completion and parses the "flights" array element by
+        element instead of waiting for the full response.
+        """
+        try:
+            request = await self._build_request(origin, destination, date)
+
+            cache_key = request_key(request)
+            if self.response_cache is not None:
+                cached = await self.response_cache.get(cache_key, FlightOption)
+                if cached is not None:
+                    logger.info("flight_cache_hit", count=len(cached))
+                    for flight in cached:
+                        yield flight
+                    return
+
+            parser = JSONArrayStreamParser("flights")
+            flights = []
+            metrics = get_metrics()
+            started = time.perf_counter()
+            first_token = False
+            response = await self.gateway.stream(**request)
+            async with response:
+                async for chunk in response:
+                    if not chunk.choices or not chunk.choices[0].delta.content:
+                        continue
+                    if not first_token:
+                        first_token = True
+                        metrics.record_stage("llm_first_token", time.perf_counter() - started)
+                    for flight_data in parser.feed(chunk.choices[0].delta.content):
+                        flight = FlightOption(**flight_data)
+                        flights.append(flight)
+                        yield flight
+            metrics.record_stage("llm_stream", time.perf_counter() - started)
+
+            # A truncated or malformed completion must not be cached as a (partial) result
+            if not parser.done:
+                raise ValueError('Streamed response has no complete "flights" array')
 
-            if not flight_data.get("flights"):
-                logger.info(
-                    f"No flights found for route: {origin} to {destination}")
-                return []
+            if not flights:
+                logger.info(f"No flights found for route: {origin} to {destination}")
 
-            return [FlightOption(**flight) for flight in flight_data["flights"]]
+            if self.response_cache is not None:
+                await self.response_cache.set(
+                    cache_key, flights, ttl=self.settings.flight_cache_ttl)
 
         except Exception as e:
             logger.error("flight_search_error", error=str(e))
@@ -1,70 +1,180 @@
 from .base import BaseAgent
-from openai import AsyncOpenAI
-from typing import List
-from ..schemas.models import HotelOption
+from typing import AsyncIterator, List
+from ..schemas.models import HotelOption, HotelSearchResult
 from ..config import get_settings
+from ..utils.json_stream import JSONArrayStreamParser
+from ..utils.llm_cache import get_llm_cache
+from ..utils.llm_gateway import LLMGateway, get_llm_gateway
 from ..utils.logger import logger
+from ..utils.metrics import get_metrics
+from ..utils.singleflight import single_flight, request_key
+from ..utils.structured_output import parse_structured, structured_request
 from ..utils.validators import CityValidator
 import json
-from agentops import track_agent, record_tool
+import time
+from ..utils.monitoring import track_agent, record_action
 
 
 @track_agent(name="HotelAgent")
 class HotelAgent(BaseAgent):
     def __init__(self):
         self.settings = get_settings()
-        self.client = AsyncOpenAI(api_key=self.settings.openai_api_key)
         self.city_validator = CityValidator(self.settings.weather_api_key)
+        self.response_cache = get_llm_cache()
 
-    @record_tool(tool_name="execute")
+    @property
+    def gateway(self) -> LLMGateway:
+        # Looked up per call: the shared gateway is rebuilt when the event loop changes
+        return get_llm_gateway()
+
+    async def _build_request(self, city: str, date: str) -> dict:
+        """Validate the city and build the completion request for the stay."""
+        # Validate city first
+        is_valid, validated_city = await self.city_validator.validate_city(city)
+
+        if not is_valid:
+            raise ValueError(f"Invalid city: {city}")
+
+        # Use validated city name
+        city = validated_city
+
+        if self.settings.llm_structured_output:
+            return structured_request(
+                HotelSearchResult,
+                f"You are a hotel recommendation assistant. Give up to {self.settings.llm_max_options} realistic "
+                "hotels: prices fit the city's cost of living, ratings vary and match the amenities, locations "
+                "are real areas of the city. Ratings are 1-5, prices per night in USD.",
+                f"Hotels in {city} for a stay on {date}. Empty list if the city is too small or unsuitable for tourism."
+            )
+
+        system_prompt = """You are a hotel recommendation assistant. 
+        IMPORTANT: Generate realistic hotel options based on these rules:
+        1. Only suggest hotels for cities that actually exist
+        2. Prices should reflect the city's cost of living
+        3. Ratings should be realistic (not all hotels are 5-star)
+        4. Location descriptions should be specific to the city
+        5. Amenities should be realistic for the hotel's rating
+        
+        Provide hotel options in JSON format with the following structure:
+        {
+            "hotels": [
+                {
+                    "name": "Hotel Name",
+                    "rating": float (1-5),
+                    "price_per_night": float,
+                    "location": "area in city",
+                    "amenities": ["amenity1", "amenity2", ...]
+                }
+            ]
+        }"""
+
+        return dict(
+            model=self.settings.openai_model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": f"Find hotels in {city} for stay on {date}. If this city is too small or not suitable for tourism, respond with empty hotels array."}
+            ],
+            response_format={"type": "json_object"}
+        )
+
+    @staticmethod
+    def _from_data(data: dict) -> HotelSearchResult:
+        return HotelSearchResult(hotels=HotelOption.list_from_api_response(data.get("hotels") or []))
+
+    def _parse(self, content: str) -> List[HotelOption]:
+        """Turn completion text into hotel options."""
+        metrics = get_metrics()
+        if self.settings.llm_structured_output:
+            # The schema already fixed the shape, so validate in one pass
+            with metrics.timer("structured_parse"):
+                return parse_structured(HotelSearchResult, content, self._from_data).hotels
+        with metrics.timer("json_parse"):
+            hotel_data = json.loads(content)
+        with metrics.timer("model_build"):
+            return self._from_data(hotel_data).hotels
+
+    @record_action("execute")
     async def execute(self, city: str, date: str) -> List[HotelOption]:
         try:
-            # Validate city first
-            is_valid, validated_city = await self.city_validator.validate_city(city)
-
-            if not is_valid:
-                raise ValueError(f"Invalid city: {city}")
-
-            # Use validated city name
-            city = validated_city
-
-            system_prompt = """You are a hotel recommendation assistant. 
-            IMPORTANT: Generate realistic hotel options based on these rules:
-            1. Only suggest hotels for cities that actually exist
-            2. Prices should reflect the city's cost of living
-            3. Ratings should be realistic (not all hotels are 5-star)
-            4. Location descriptions should be specific to the city
-            5. Amenities should be realistic for the hotel's rating
-            
-            Provide hotel options in JSON format with the following structure:
-            {
-                "hotels": [
-                    {
-                        "name": "Hotel Name",
-                        "rating": float (1-5),
-                        "price_per_night": float,
-                        "location": "area in city",
-                        "amenities": ["amenity1", "amenity2", ...]
-                    }
-                ]
-            }"""
-
-            response = await self.client.chat.completions.create(
-                model=self.settings.openai_model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Find hotels in {city} for stay on {date}. If this city is too small or not suitable for tourism, respond with empty hotels array."}
-                ],
-                response_format={"type": "json_object"}
+            request = await self._build_request(city, date)
+
+            # Repeated searches are served from the parsed-result cache
+            cache_key = request_key(request)
+            if self.response_cache is not None:
+                cached = await self.response_cache.get(cache_key, HotelOption)
+                if cached is not None:
+                    logger.info("hotel_cache_hit", count=len(cached))
+                    return cached
+
+            # Identical concurrent searches share one completion
+            response = await single_flight("openai").do(
+                cache_key,
+                lambda: self.gateway.complete(**request)
             )
 
-            hotel_data = json.loads(response.choices[0].message.content)
+            hotels = self._parse(response.choices[0].message.content)
+
+            if not hotels:
+                logger.info(f"No hotels found for city: {city}")
+
+            if self.response_cache is not None:
+                await self.response_cache.set(
+                    cache_key, hotels, ttl=self.settings.hotel_cache_ttl)
+
+            return hotels
+
+        except Exception as e:
+            logger.error("hotel_search_error", error=str(e))
+            raise
+
+    async def stream(self, city: str, date: str) -> AsyncIterator[HotelOption]:
+        """
+        Yield each HotelOption as soon as its JSON object is complete.
+
+        Uses a streaming completion and parses the "hotels" array element by
+        element instead of waiting for the full response.
+        """
+        try:
+            request = await self._build_request(city, date)
+
+            cache_key = request_key(request)
+            if self.response_cache is not None:
+                cached = await self.response_cache.get(cache_key, HotelOption)
+                if cached is not None:
+                    logger.info("hotel_cache_hit", count=len(cached))
+                    for hotel in cached:
+                        yield hotel
+                    return
+
+            parser = JSONArrayStreamParser("hotels")
+            hotels = []
+            metrics = get_metrics()
+            started = time.perf_counter()
+            first_token = False
+            response = await self.gateway.stream(**request)
+            async with response:
+                async for chunk in response:
+                    if not chunk.choices or not chunk.choices[0].delta.content:
+                        continue
+                    if not first_token:
+                        first_token = True
+                        metrics.record_stage("llm_first_token", time.perf_counter() - started)
+                    for hotel_data in parser.feed(chunk.choices[0].delta.content):
+                        hotel = HotelOption.from_api_response(hotel_data)
+                        hotels.append(hotel)
+                        yield hotel
+            metrics.record_stage("llm_stream", time.perf_counter() - started)
+
+            # A truncated or malformed completion must not be cached as a (partial) result
+            if not parser.done:
+                raise ValueError('Streamed response has no complete "hotels" array')
 
-            if not hotel_data.get("hotels"):
+            if not hotels:
                 logger.info(f"No hotels found for city: {city}")
-                return []
 
-            return [HotelOption.from_api_response(hotel) for hotel in hotel_data["hotels"]]
+            if self.response_cache is not None:
+                await self.response_cache.set(
+                    cache_key, hotels, ttl=self.settings.hotel_cache_ttl)
 
         except Exception as e:
             logger.error("hotel_search_error", error=str(e))
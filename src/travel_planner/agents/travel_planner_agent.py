@@ -1,84 +1,396 @@
-from typing import Optional, List
+from typing import TYPE_CHECKING, AsyncIterator, Optional, List, Dict, Tuple
+from contextlib import aclosing
 import asyncio
+import json
+import time
+from pydantic import ValidationError
 from .base import BaseAgent
-from .weather_agent import WeatherAgent
-from .flight_agent import FlightAgent
-from .hotel_agent import HotelAgent
-from ..schemas.models import TravelPlan, WeatherForecast, FlightOption, HotelOption, ServiceStatus
+from ..config import get_settings
+from ..schemas.models import (TravelPlan, WeatherForecast, FlightOption, HotelOption, ServiceStatus,
+                              ServiceUpdate, PlanCompleted, PlanEvent, DateOption, DateRangePlan)
+from ..utils.dates import date_range
+from ..utils.exceptions import CityValidationError, ServiceError
 from ..utils.logger import logger
-from agentops import track_agent, record_tool
+from ..utils.metrics import get_metrics
+from ..utils.monitoring import track_agent, record_action
+
+if TYPE_CHECKING:
+    # Sub-agent modules pull in the OpenAI SDK; only import what a run uses
+    from .weather_agent import WeatherAgent
+    from .flight_agent import FlightAgent
+    from .hotel_agent import HotelAgent
+    from .combined_agent import CombinedSearchAgent
 
 
 @track_agent(name="TravelPlannerAgent")
 class TravelPlannerAgent(BaseAgent):
     def __init__(
         self,
-        weather_agent: WeatherAgent,
-        flight_agent: FlightAgent,
-        hotel_agent: HotelAgent
+        weather_agent: Optional["WeatherAgent"],
+        flight_agent: Optional["FlightAgent"],
+        hotel_agent: Optional["HotelAgent"],
+        combined_agent: Optional["CombinedSearchAgent"] = None
     ):
         self.weather_agent = weather_agent
         self.flight_agent = flight_agent
         self.hotel_agent = hotel_agent
+        self.combined_agent = combined_agent
 
-    @record_tool(tool_name="execute")
-    async def execute(
+        settings = get_settings()
+        self.plan_timeout = settings.plan_timeout
+        self.service_timeouts = {
+            "weather": settings.weather_timeout,
+            "flights": settings.flights_timeout,
+            "hotels": settings.hotels_timeout
+        }
+        # Forward flight and hotel options as the LLM generates them
+        self.stream_options = settings.llm_streaming
+        # Ask for flights and hotels in one completion instead of two
+        self.fused_search = settings.llm_fused_search
+        self.date_range_max_days = settings.date_range_max_days
+        self.date_range_concurrency = settings.date_range_concurrency
+
+    async def _fused_search(self, origin: str, destination: str, date: str) -> Tuple:
+        """
+        Run the combined flight+hotel completion, falling back to the separate agents.
+
+        Returns one result per service, either an option list or the exception
+        that service failed with, so each can still succeed independently.
+        Only an unparseable fused response falls back; outages, rate limits
+        and invalid cities would fail the separate calls the same way.
+        """
+        try:
+            return await self.combined_agent.execute(origin, destination, date)
+        except (json.JSONDecodeError, ValidationError) as e:
+            logger.warning("fused_search_fallback", error=str(e))
+            return tuple(await asyncio.gather(
+                self.flight_agent.execute(origin, destination, date),
+                self.hotel_agent.execute(destination, date),
+                return_exceptions=True
+            ))
+        except Exception as e:
+            return e, e
+
+    @staticmethod
+    async def _fused_part(shared: asyncio.Task, index: int) -> list:
+        """Await one service's share of a fused search without cancelling the other's."""
+        result = (await asyncio.shield(shared))[index]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def _collect(self, service: str, options: AsyncIterator, partials: asyncio.Queue) -> list:
+        """Drain a streaming sub-agent, queueing each option as a partial update."""
+        field = "flight_options" if service == "flights" else "hotel_options"
+        collected = []
+        async with aclosing(options):
+            async for option in options:
+                collected.append(option)
+                partials.put_nowait(ServiceUpdate(
+                    service=service,
+                    status=ServiceStatus(status=True),
+                    partial=True,
+                    **{field: [option]}
+                ))
+        return collected
+
+    @staticmethod
+    async def _timed(service: str, call) -> object:
+        with get_metrics().timer(f"service_{service}"):
+            return await call
+
+    def _start_services(
+        self,
+        origin: str,
+        destination: str,
+        date: str,
+        partials: Optional[asyncio.Queue] = None,
+        include_weather: bool = True
+    ) -> Tuple[Dict[str, asyncio.Task], List[asyncio.Task]]:
+        """
+        Start each enabled sub-agent as a task bounded by its own time budget.
+
+        Returns the per-service tasks and any shared helper tasks, which the
+        caller must cancel along with them.
+        """
+        calls = {}
+        helpers = []
+        if self.weather_agent is not None and include_weather:
+            calls["weather"] = self.weather_agent.execute(destination, date)
+        if (self.fused_search and partials is None
+                and self.flight_agent is not None and self.hotel_agent is not None):
+            if self.combined_agent is None:
+                from .combined_agent import CombinedSearchAgent
+                self.combined_agent = CombinedSearchAgent()
+            shared = asyncio.ensure_future(self._fused_search(origin, destination, date))
+            helpers.append(shared)
+            calls["flights"] = self._fused_part(shared, 0)
+            calls["hotels"] = self._fused_part(shared, 1)
+        elif self.flight_agent is not None:
+            if partials is not None:
+                calls["flights"] = self._collect(
+                    "flights", self.flight_agent.stream(origin, destination, date), partials)
+            else:
+                calls["flights"] = self.flight_agent.execute(origin, destination, date)
+        if self.hotel_agent is not None and "hotels" not in calls:
+            if partials is not None:
+                calls["hotels"] = self._collect(
+                    "hotels", self.hotel_agent.stream(destination, date), partials)
+            else:
+                calls["hotels"] = self.hotel_agent.execute(destination, date)
+
+        tasks = {
+            service: asyncio.ensure_future(
+                asyncio.wait_for(self._timed(service, call), timeout=self.service_timeouts[service]))
+            for service, call in calls.items()
+        }
+        return tasks, helpers
+
+    def _service_result(self, service: str, task: Optional[asyncio.Task]):
+        """Return (ServiceStatus, result) for a finished, failed or timed-out task."""
+        if task is None:
+            return ServiceStatus(error="Service not enabled"), None
+        if task.cancelled():
+            return ServiceStatus(
+                error=f"{service.title()} service did not finish within the {self.plan_timeout:g}s plan deadline",
+                timed_out=True
+            ), None
+
+        error = task.exception()
+        if isinstance(error, asyncio.TimeoutError):
+            return ServiceStatus(
+                error=f"{service.title()} service timed out after {self.service_timeouts[service]:g}s",
+                timed_out=True
+            ), None
+        if error is not None:
+            return ServiceStatus(error=str(error)), None
+        return ServiceStatus(status=True), task.result()
+
+    @staticmethod
+    async def _cancel(tasks) -> None:
+        """Cancel unfinished tasks and wait until they have unwound."""
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _service_update(self, service: str, task: Optional[asyncio.Task]) -> ServiceUpdate:
+        status, result = self._service_result(service, task)
+        update = ServiceUpdate(service=service, status=status)
+        if service == "weather":
+            update.weather_forecast = result
+        elif service == "flights":
+            update.flight_options = result
+        else:
+            update.hotel_options = result
+        return update
+
+    async def stream(
         self,
         origin: str,
         destination: str,
         date: str
-    ) -> TravelPlan:
+    ) -> AsyncIterator[PlanEvent]:
+        """
+        Yield a ServiceUpdate as each sub-agent finishes, then a PlanCompleted.
+
+        With stream_options enabled, flights and hotels also yield partial
+        updates carrying each option as soon as the LLM has generated it.
+        Services still running at the plan deadline are cancelled and reported
+        as timed out. Closing the generator early cancels outstanding work.
+        """
+        tasks: Dict[str, asyncio.Task] = {}
+        helpers: List[asyncio.Task] = []
+        getter: Optional[asyncio.Task] = None
+        metrics = get_metrics()
+        started = time.perf_counter()
         try:
-            # Execute all agents concurrently
-            weather_task = self.weather_agent.execute(destination, date)
-            flights_task = self.flight_agent.execute(origin, destination, date)
-            hotels_task = self.hotel_agent.execute(destination, date)
+            partials = asyncio.Queue() if self.stream_options else None
+            tasks, helpers = self._start_services(origin, destination, date, partials)
+            services = {task: service for service, task in tasks.items()}
+            updates: Dict[str, ServiceUpdate] = {}
 
-            results = await asyncio.gather(
-                weather_task, flights_task, hotels_task,
-                return_exceptions=True
-            )
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.plan_timeout
+            pending = set(tasks.values())
+            while pending:
+                if partials is not None and getter is None:
+                    getter = asyncio.ensure_future(partials.get())
+                done, _ = await asyncio.wait(
+                    pending | {getter} if getter else pending,
+                    timeout=max(0.0, deadline - loop.time()),
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if getter in done:
+                    yield getter.result()
+                    getter = None
 
-            service_statuses = {
-                "weather": ServiceStatus(),
-                "flights": ServiceStatus(),
-                "hotels": ServiceStatus()
-            }
+                done &= pending
+                pending -= done
+                if not done and loop.time() >= deadline:
+                    logger.warning("plan_deadline_exceeded",
+                                   services=[services[task] for task in pending])
+                    await self._cancel(pending)
+                    done, pending = pending, set()
 
-            # Process weather result
-            if isinstance(results[0], Exception):
-                service_statuses["weather"].error = str(results[0])
-                weather_forecast = WeatherForecast()
-            else:
-                service_statuses["weather"].status = True
-                weather_forecast = results[0]
+                if done and getter is not None:
+                    # Stop waiting so queued partials can be flushed in order
+                    await self._cancel([getter])
+                    if not getter.cancelled():
+                        yield getter.result()
+                    getter = None
+                while done and partials is not None and not partials.empty():
+                    yield partials.get_nowait()
 
-            # Process flight result
-            if isinstance(results[1], Exception):
-                service_statuses["flights"].error = str(results[1])
-                flight_options = []
-            else:
-                service_statuses["flights"].status = True
-                flight_options = results[1]
+                for task in done:
+                    update = self._service_update(services[task], task)
+                    updates[update.service] = update
+                    yield update
 
-            # Process hotel result
-            if isinstance(results[2], Exception):
-                service_statuses["hotels"].error = str(results[2])
-                hotel_options = []
-            else:
-                service_statuses["hotels"].status = True
-                hotel_options = results[2]
+            # Assemble the plan, including services that were never enabled
+            updates = {
+                service: updates.get(service) or self._service_update(service, None)
+                for service in ("weather", "flights", "hotels")
+            }
 
-            # Create travel plan
-            plan = TravelPlan(
-                weather_forecast=weather_forecast,
-                flight_options=flight_options,
-                hotel_options=hotel_options,
-                service_status=service_statuses
-            )
+            metrics.record_stage("plan", time.perf_counter() - started)
+            for service, update in updates.items():
+                if service not in tasks:
+                    continue
+                if update.status.status:
+                    result = "ok"
+                elif update.status.timed_out:
+                    result = "timeout"
+                else:
+                    result = "error"
+                metrics.inc("service_results_total", service=service, result=result)
 
-            return plan
+            yield PlanCompleted(plan=TravelPlan(
+                weather_forecast=updates["weather"].weather_forecast or WeatherForecast(),
+                flight_options=updates["flights"].flight_options or [],
+                hotel_options=updates["hotels"].hotel_options or [],
+                service_status={s: u.status for s, u in updates.items()}
+            ))
 
         except Exception as e:
             logger.error("trip_planning_error", error=str(e))
             raise
+
+        finally:
+            # Never leak sub-agent work, e.g. when the consumer stops early
+            pending = [task for task in [*tasks.values(), *helpers] if not task.done()]
+            if getter is not None:
+                pending.append(getter)
+            if pending:
+                await self._cancel(pending)
+
+    @record_action("execute")
+    async def execute(
+        self,
+        origin: str,
+        destination: str,
+        date: str
+    ) -> TravelPlan:
+        plan = None
+        async for event in self.stream(origin, destination, date):
+            if isinstance(event, PlanCompleted):
+                plan = event.plan
+        return plan
+
+    async def _search_date(self, origin: str, destination: str, date: str, slots: asyncio.Semaphore) -> DateOption:
+        """Run flights and hotels for one day of a range, each within its own time budget."""
+        async with slots:
+            tasks, helpers = self._start_services(origin, destination, date, include_weather=False)
+            try:
+                if tasks:
+                    await asyncio.wait(tasks.values())
+            finally:
+                await self._cancel([task for task in [*tasks.values(), *helpers] if not task.done()])
+
+        option = DateOption(date=date)
+        prices = []
+        for service in ("flights", "hotels"):
+            if service not in tasks:
+                continue
+            status, result = self._service_result(service, tasks[service])
+            option.service_status[service] = status
+            if service == "flights":
+                option.flight_options = result or []
+                option.cheapest_flight = min(option.flight_options, key=lambda f: f.price, default=None)
+                prices.append(option.cheapest_flight.price if option.cheapest_flight else None)
+            else:
+                option.hotel_options = result or []
+                option.cheapest_hotel = min(option.hotel_options, key=lambda h: h.price_per_night, default=None)
+                prices.append(option.cheapest_hotel.price_per_night if option.cheapest_hotel else None)
+
+        if prices and None not in prices:
+            option.total_price = round(sum(prices), 2)
+        return option
+
+    async def execute_range(
+        self,
+        origin: str,
+        destination: str,
+        date_from: str,
+        date_to: str
+    ) -> DateRangePlan:
+        """
+        Search every day from date_from to date_to and rank the days by price.
+
+        Cities are validated once and weather is fetched once for the whole
+        range; only flights and hotels fan out per day, at most
+        date_range_concurrency days at a time. Raises ValueError for an invalid
+        range, CityValidationError if either city does not exist and
+        ServiceError if WeatherAPI cannot be reached to check them.
+        """
+        import httpx
+
+        from ..utils.validators import CityValidator
+
+        dates = date_range(date_from, date_to, self.date_range_max_days)
+        settings = get_settings()
+
+        # Resolve both cities up front: an invalid city fails the range before
+        # any fan-out, and the per-day searches validate from the warm cache
+        validator = CityValidator(settings.weather_api_key)
+        cities = [destination] if self.flight_agent is None else [origin, destination]
+        try:
+            resolved = await asyncio.gather(*(validator.resolve_city(c) for c in cities))
+        except httpx.HTTPError as e:
+            raise ServiceError(f"Unable to reach weather service to validate cities: {e}") from e
+        for city, found in zip(cities, resolved):
+            if found is None:
+                raise CityValidationError(
+                    f"'{city}' is not a valid city name. Please check the spelling and try again.")
+
+        weather = None
+        if self.weather_agent is not None:
+            weather = asyncio.ensure_future(asyncio.wait_for(
+                self._timed("weather", self.weather_agent.execute(destination, date_from)),
+                timeout=self.service_timeouts["weather"]))
+        slots = asyncio.Semaphore(self.date_range_concurrency)
+        days = [asyncio.ensure_future(self._search_date(origin, destination, date, slots)) for date in dates]
+
+        try:
+            with get_metrics().timer("date_range"):
+                options = await asyncio.gather(*days)
+                if weather is not None:
+                    await asyncio.wait([weather])
+        finally:
+            await self._cancel([task for task in [*days, weather] if task is not None and not task.done()])
+
+        priced = sorted((o for o in options if o.total_price is not None), key=lambda o: (o.total_price, o.date))
+        for rank, option in enumerate(priced, start=1):
+            option.rank = rank
+
+        weather_status, forecast = self._service_result("weather", weather)
+        logger.info("date_range_completed", origin=origin, destination=destination,
+                    days=len(dates), priced=len(priced))
+        return DateRangePlan(
+            origin=origin,
+            destination=destination,
+            date_from=date_from,
+            date_to=date_to,
+            weather_forecast=forecast or WeatherForecast(),
+            weather_status=weather_status,
+            dates=list(options)
+        )
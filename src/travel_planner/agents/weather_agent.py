@@ -1,11 +1,12 @@
 from .base import BaseAgent
-import requests
+import httpx
 from ..schemas.models import WeatherForecast
 from ..config import get_settings
 from ..utils.logger import logger
+from ..utils.metrics import get_metrics
 from ..utils.validators import CityValidator
 from ..utils.exceptions import CityValidationError, ServiceError
-from agentops import track_agent, record_tool
+from ..utils.monitoring import track_agent, record_action
 
 
 @track_agent(name="WeatherAgent")
@@ -20,53 +21,37 @@ class WeatherAgent(BaseAgent):
             raise ValueError(
                 "Weather API key not found in environment variables")
 
-    @record_tool(tool_name="execute")
+    @record_action("execute")
     async def execute(self, destination: str, date: str) -> WeatherForecast:
         try:
-            # First validate the city
-            is_valid, validated_city = await self.city_validator.validate_city(destination)
+            # Validation and current conditions come from the same
+            # current.json response, shared with the other agents
+            resolved = await self.city_validator.resolve_city(
+                destination, max_age=self.settings.weather_max_age)
 
-            if not is_valid:
+            if resolved is None:
                 raise CityValidationError(
                     f"'{destination}' is not a valid city name. Please check the spelling and try again.")
 
-            endpoint = f"{self.base_url}/current.json"
-            params = {
-                "key": self.api_key,
-                "q": validated_city  # Use the validated city name
-            }
+            logger.info("weather_resolved",
+                        destination=resolved.canonical_name,
+                        age_seconds=round(resolved.age_seconds, 1))
 
-            logger.info("calling_weather_api",
-                        destination=validated_city,
-                        endpoint=endpoint)
-
-            response = requests.get(endpoint, params=params)
-
-            if response.status_code != 200:
-                raise ServiceError(
-                    f"Weather service error (Status: {response.status_code})")
-
-            data = response.json()
-
-            if "current" not in data:
+            if not resolved.current:
                 raise ServiceError("Invalid response from Weather API")
 
-            current = data["current"]
-            condition = current.get("condition", {})
-
-            return WeatherForecast(
-                temperature=current.get("temp_c", 0.0),
-                condition=condition.get("text", "Unknown"),
-                precipitation_chance=current.get("precip_mm", 0.0)
-            )
+            with get_metrics().timer("model_build"):
+                return WeatherForecast.from_api_response(resolved.current)
 
         except CityValidationError as e:
             logger.warning(f"Invalid city: {destination}", error=str(e))
             raise
-        except requests.exceptions.ConnectionError:
+        except ServiceError:
+            raise
+        except httpx.ConnectError:
             raise ServiceError(
                 "Unable to connect to weather service. Please check your internet connection.")
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             raise ServiceError(
                 "Weather service request timed out. Please try again.")
         except Exception as e:
@@ -0,0 +1,92 @@
+import asyncio
+import csv
+import json
+import sys
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional, TextIO, Union
+
+from .agents.travel_planner_agent import TravelPlannerAgent
+from .schemas import codec
+from .schemas.models import BatchResult
+from .utils.logger import logger
+
+QUERY_FIELDS = ("origin", "destination", "date")
+
+
+def read_queries(source: str, input_format: Optional[str] = None) -> List[Dict[str, str]]:
+    """
+    Read batch queries from a CSV or JSONL file, or from stdin when source is "-".
+
+    CSV input needs a header row with origin, destination and date columns.
+    The format is taken from the file extension unless given explicitly.
+    """
+    if input_format is None:
+        input_format = "csv" if source != "-" and Path(source).suffix.lower() == ".csv" else "jsonl"
+
+    stream = sys.stdin if source == "-" else open(source, newline="", encoding="utf-8")
+    try:
+        if input_format == "csv":
+            rows = list(csv.DictReader(stream))
+        else:
+            rows = [json.loads(line) for line in stream if line.strip()]
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    return [
+        {field: (str(row.get(field) or "")).strip() for field in QUERY_FIELDS}
+        for row in rows
+    ]
+
+
+async def run_batch(
+    travel_planner: TravelPlannerAgent,
+    queries: Iterable[Dict[str, str]],
+    output: Union[TextIO, BinaryIO],
+    concurrency: int = 8,
+    validate_date: Optional[Callable[[str], str]] = None,
+    output_format: str = "jsonl"
+) -> int:
+    """
+    Plan every query through one shared TravelPlannerAgent.
+
+    At most `concurrency` plans run at once and each result is written as
+    soon as it completes: as a JSONL line to a text stream, or with
+    output_format="msgpack" as one codec message per result to a binary
+    stream (read it back with codec.iter_load). All plans share the city
+    resolution cache, request coalescing and LLM response cache, so repeated
+    cities and routes are only looked up once per batch. Returns the number
+    of failed queries.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def plan_one(index: int, query: Dict[str, str]) -> BatchResult:
+        record = BatchResult(index=index, **query)
+        async with semaphore:
+            try:
+                if validate_date is not None:
+                    validate_date(query["date"])
+                record.plan = await travel_planner.execute(
+                    origin=query["origin"],
+                    destination=query["destination"],
+                    date=query["date"]
+                )
+            except Exception as e:
+                logger.error("batch_query_error", index=index, error=str(e))
+                record.error = str(e)
+        return record
+
+    failures = 0
+    tasks = [asyncio.ensure_future(plan_one(i, q)) for i, q in enumerate(queries)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            record = await next_done
+            failures += record.error is not None
+            output.write(codec.dumps(record) if output_format == "msgpack" else record.to_json() + "\n")
+            output.flush()
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    logger.info("batch_completed", queries=len(tasks), failures=failures)
+    return failures
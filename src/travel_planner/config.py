@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Optional
 
 from pydantic_settings import BaseSettings
 
@@ -9,11 +10,104 @@ class Settings(BaseSettings):
     environment: str = "development"
     weather_api_base_url: str = "http://api.weatherapi.com/v1"
     openai_model: str = "gpt-4-turbo-preview"
+    openai_base_url: Optional[str] = None
     agentops_api_key: str
 
+    # Shared async HTTP client
+    http_timeout: float = 10.0
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+
+    # Shared city resolution cache
+    city_cache_size: int = 2048
+    city_cache_ttl: float = 86400.0
+    city_cache_negative_ttl: float = 600.0
+    weather_max_age: float = 600.0
+
+    # LLM response cache (set llm_cache_path to "" for memory only)
+    llm_cache_enabled: bool = True
+    llm_cache_path: str = ".cache/llm_responses.sqlite3"
+    llm_cache_memory_size: int = 512
+    llm_cache_max_bytes: int = 64 * 1024 * 1024
+    llm_cache_ttl: float = 3600.0
+    flight_cache_ttl: float = 900.0
+    hotel_cache_ttl: float = 3600.0
+
+    # Plan deadlines in seconds; services still running at the deadline are cancelled
+    plan_timeout: float = 30.0
+    weather_timeout: float = 10.0
+    flights_timeout: float = 25.0
+    hotels_timeout: float = 25.0
+
+    # Stream flight and hotel completions and parse options as they arrive
+    llm_streaming: bool = False
+    # Generate flights and hotels with one completion, falling back to separate calls
+    llm_fused_search: bool = False
+    # Compact prompts with strict JSON-schema responses, capped at llm_max_options
+    # options and llm_max_tokens output tokens per completion
+    llm_structured_output: bool = False
+    llm_max_options: int = 5
+    llm_max_tokens: int = 1000
+
+    # Shared LLM gateway (0 disables a rate limit)
+    llm_requests_per_minute: int = 500
+    llm_tokens_per_minute: int = 150000
+    llm_max_concurrency: int = 16
+    llm_max_retries: int = 4
+    llm_backoff_base: float = 0.5
+    llm_backoff_max: float = 20.0
+    llm_estimated_completion_tokens: int = 700
+    # Race a duplicate request against completions slower than the hedge percentile
+    llm_hedging: bool = False
+    llm_hedge_percentile: float = 0.95
+    llm_hedge_min_delay: float = 0.5
+    llm_hedge_min_samples: int = 20
+    llm_hedge_budget: float = 0.05
+
+    # Per-upstream circuit breakers and the shared retry budget
+    circuit_window: int = 20
+    circuit_min_calls: int = 10
+    circuit_failure_rate: float = 0.5
+    circuit_slow_call_rate: float = 0.8
+    circuit_weather_slow_call_seconds: float = 5.0
+    circuit_openai_slow_call_seconds: float = 30.0
+    circuit_open_seconds: float = 30.0
+    circuit_half_open_calls: int = 2
+    weather_max_retries: int = 1
+    retry_budget_ratio: float = 0.1
+    retry_budget_min_per_second: float = 1.0
+
+    # Monitoring export
+    monitoring_enabled: bool = True
+    monitoring_queue_size: int = 10000
+    monitoring_batch_size: int = 100
+    monitoring_flush_interval: float = 2.0
+    monitoring_sample_threshold: float = 0.5
+    monitoring_sample_rate: float = 0.1
+
+    # Date-range search
+    date_range_max_days: int = 31
+    date_range_concurrency: int = 4
+
+    # Popular-route warm cache (server mode)
+    warm_routes_file: str = ""
+    warm_ttl: float = 900.0
+    warm_stale_ttl: float = 3600.0
+    warm_refresh_ahead: float = 0.2
+    warm_jitter: float = 0.1
+    warm_check_interval: float = 30.0
+    warm_concurrency: int = 4
+
+    # HTTP server mode
+    server_host: str = "127.0.0.1"
+    server_port: int = 8000
+    server_max_inflight: int = 64
+    server_max_queue: int = 256
+    server_shutdown_timeout: float = 30.0
+
     class Config:
         env_file = ".env"
 
 @lru_cache()
 def get_settings():
-    return Settings()
\ No newline at end of file
+    return Settings()
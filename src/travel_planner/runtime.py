@@ -0,0 +1,80 @@
+import asyncio
+import queue
+import threading
+from typing import Any, Coroutine, Iterator
+
+from .agents.flight_agent import FlightAgent
+from .agents.hotel_agent import HotelAgent
+from .agents.travel_planner_agent import TravelPlannerAgent
+from .agents.weather_agent import WeatherAgent
+from .schemas.models import PlanEvent
+from .utils.http import close_http_client
+from .utils.llm_gateway import close_llm_gateway
+
+_DONE = object()
+
+
+class PlannerRuntime:
+    """
+    Long-lived agents and event loop for synchronous hosts such as Streamlit.
+
+    A single event loop runs in a daemon thread for the life of the process,
+    so the pooled HTTP connections, OpenAI clients and validation caches
+    survive across script reruns instead of being rebuilt on every call.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name="travel-planner-loop", daemon=True)
+        self._thread.start()
+        self.travel_planner = TravelPlannerAgent(
+            weather_agent=WeatherAgent(),
+            flight_agent=FlightAgent(),
+            hotel_agent=HotelAgent()
+        )
+
+    def run(self, coro: Coroutine) -> Any:
+        """Run a coroutine on the shared loop and block until it finishes."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def iter_plan(self, origin: str, destination: str, date: str) -> Iterator[PlanEvent]:
+        """
+        Yield plan events in the calling thread as the shared loop produces them.
+
+        Lets callers render each event immediately, e.g. in Streamlit's script
+        thread. Stopping the iteration early cancels the plan.
+        """
+        events: "queue.Queue[Any]" = queue.Queue()
+
+        async def pump():
+            try:
+                async for event in self.travel_planner.stream(origin, destination, date):
+                    events.put(event)
+            except Exception as e:
+                events.put(e)
+            finally:
+                events.put(_DONE)
+
+        future = asyncio.run_coroutine_threadsafe(pump(), self.loop)
+        try:
+            while True:
+                item = events.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            future.cancel()
+
+    def close(self) -> None:
+        """Close pooled clients and stop the loop thread."""
+        async def shutdown():
+            await close_llm_gateway()
+            await close_http_client()
+
+        self.run(shutdown())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
@@ -0,0 +1,165 @@
+"""
+Versioned compact binary encoding for the plan and option models.
+
+Models are packed with msgpack as arrays in field declaration order, so
+field names are never repeated. Every message starts with a header of the
+format version, the type name and a fingerprint of the field layout; a
+message written before a model changed shape fails to decode with a
+CodecError instead of being read into the wrong fields.
+"""
+import zlib
+from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter
+from typing import IO, Any, Dict, Iterator, List, Tuple, Type, TypeVar, Union, get_args, get_origin
+
+import msgpack
+from pydantic import BaseModel, ValidationError
+
+FORMAT_VERSION = 1
+
+M = TypeVar("M", bound=BaseModel)
+
+# Field kinds: PLAIN values pass through msgpack unchanged
+PLAIN = ("plain",)
+DATETIME = ("datetime",)
+
+
+class CodecError(ValueError):
+    """Raised when bytes are not a message of the expected version, type and layout."""
+
+
+def _kind(annotation: Any) -> tuple:
+    origin, args = get_origin(annotation), get_args(annotation)
+    if origin is Union:
+        present = [arg for arg in args if arg is not type(None)]
+        inner = _kind(present[0]) if len(present) == 1 else PLAIN
+        return PLAIN if inner == PLAIN else ("optional", inner)
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return ("model", annotation)
+    if annotation is datetime:
+        return DATETIME
+    if origin in (list, List):
+        inner = _kind(args[0])
+        return PLAIN if inner == PLAIN else ("list", inner)
+    if origin in (dict, Dict):
+        inner = _kind(args[1])
+        return PLAIN if inner == PLAIN else ("dict", inner)
+    return PLAIN
+
+
+@lru_cache(maxsize=None)
+def _layout(model: Type[BaseModel]) -> Tuple[Tuple[str, ...], Tuple[tuple, ...]]:
+    """Field names in declaration order and the kind of each field."""
+    names = tuple(model.model_fields)
+    return names, tuple(_kind(model.model_fields[name].annotation) for name in names)
+
+
+@lru_cache(maxsize=None)
+def _getter(model: Type[BaseModel]) -> attrgetter:
+    return attrgetter(*_layout(model)[0])
+
+
+def _describe(kind: tuple) -> str:
+    if kind[0] == "model":
+        names, kinds = _layout(kind[1])
+        return kind[1].__name__ + "(" + ",".join(f"{n}:{_describe(k)}" for n, k in zip(names, kinds)) + ")"
+    if len(kind) == 2:
+        return f"{kind[0]}[{_describe(kind[1])}]"
+    return kind[0]
+
+
+@lru_cache(maxsize=None)
+def fingerprint(model: Type[BaseModel]) -> int:
+    """CRC32 of the model's nested field layout; changes whenever a field is added, removed or moved."""
+    return zlib.crc32(_describe(("model", model)).encode())
+
+
+def _pack_value(value: Any, kind: tuple) -> Any:
+    if value is None or kind is PLAIN:
+        return value
+    tag = kind[0]
+    if tag == "model":
+        return _pack_model(value, kind[1])
+    if tag == "list":
+        return [_pack_value(item, kind[1]) for item in value]
+    if tag == "dict":
+        return {key: _pack_value(item, kind[1]) for key, item in value.items()}
+    if tag == "optional":
+        return _pack_value(value, kind[1])
+    return value.isoformat()
+
+
+def _pack_model(value: BaseModel, model: Type[BaseModel]) -> list:
+    _, kinds = _layout(model)
+    values = _getter(model)(value)
+    if len(kinds) == 1:
+        values = (values,)
+    return [v if k is PLAIN else _pack_value(v, k) for v, k in zip(values, kinds)]
+
+
+def _unpack_value(data: Any, kind: tuple) -> Any:
+    if data is None or kind is PLAIN:
+        return data
+    tag = kind[0]
+    if tag == "model":
+        return _unpack_model(data, kind[1])
+    if tag == "list":
+        return [_unpack_value(item, kind[1]) for item in data]
+    if tag == "dict":
+        return {key: _unpack_value(item, kind[1]) for key, item in data.items()}
+    if tag == "optional":
+        return _unpack_value(data, kind[1])
+    # Datetimes stay ISO strings; pydantic parses them during validation
+    return data
+
+
+def _unpack_model(data: list, model: Type[BaseModel]) -> dict:
+    names, kinds = _layout(model)
+    return {n: d if k is PLAIN else _unpack_value(d, k) for n, d, k in zip(names, data, kinds)}
+
+
+def _header(model: Type[BaseModel]) -> list:
+    return [FORMAT_VERSION, model.__name__, fingerprint(model)]
+
+
+def _check(message: Any, model: Type[BaseModel]) -> Any:
+    if not isinstance(message, list) or len(message) != 4:
+        raise CodecError("Not a travel planner message")
+    version, name, layout, body = message
+    expected = _header(model)
+    if version != FORMAT_VERSION:
+        raise CodecError(f"Unsupported format version {version}, expected {FORMAT_VERSION}")
+    if name != expected[1]:
+        raise CodecError(f"Message holds {name}, expected {expected[1]}")
+    if layout != expected[2]:
+        raise CodecError(f"{name} was encoded with a different field layout")
+    return body
+
+
+def dumps(value: BaseModel) -> bytes:
+    """Encode one model instance."""
+    model = type(value)
+    return msgpack.packb(_header(model) + [_pack_model(value, model)])
+
+
+def loads(data: bytes, model: Type[M]) -> M:
+    """Decode bytes written by dumps() back into a validated `model` instance."""
+    try:
+        message = msgpack.unpackb(data)
+    except (msgpack.ExtraData, msgpack.FormatError, msgpack.StackError, ValueError) as e:
+        raise CodecError(f"Malformed message: {e}") from e
+    return _validate(_check(message, model), model)
+
+
+def _validate(body: list, model: Type[M]) -> M:
+    try:
+        return model.model_validate(_unpack_model(body, model))
+    except ValidationError as e:
+        raise CodecError(f"Invalid {model.__name__} data: {e}") from e
+
+
+def iter_load(stream: IO[bytes], model: Type[M]) -> Iterator[M]:
+    """Decode a stream of concatenated dumps() messages, e.g. a msgpack batch output file."""
+    for message in msgpack.Unpacker(stream):
+        yield _validate(_check(message, model), model)
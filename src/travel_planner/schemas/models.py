@@ -1,6 +1,9 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
 from datetime import datetime
-from typing import List, Optional, Dict
+from functools import lru_cache
+from typing import List, Optional, Dict, Type, Union
+
+from ..utils.logger import logger
 
 class WeatherForecast(BaseModel):
     """Weather forecast data model."""
@@ -8,6 +11,31 @@ class WeatherForecast(BaseModel):
     condition: str = Field(default="Unknown", description="Weather condition description")
     precipitation_chance: float = Field(default=0.0, description="Precipitation in millimeters")
 
+    @classmethod
+    def from_api_response(cls, current: dict):
+        """Create WeatherForecast from the 'current' block of a WeatherAPI response."""
+        condition = current.get("condition", {})
+        return cls(
+            temperature=current.get("temp_c", 0.0),
+            condition=condition.get("text", "Unknown"),
+            precipitation_chance=current.get("precip_mm", 0.0)
+        )
+
+class ResolvedCity(BaseModel):
+    """A city resolved against WeatherAPI, with the current conditions returned alongside."""
+    name: str = Field(..., description="Canonical city name")
+    country: str = Field(..., description="Country of the city")
+    current: dict = Field(default_factory=dict, description="Raw 'current' block from WeatherAPI")
+    fetched_at: datetime = Field(default_factory=datetime.now)
+
+    @property
+    def canonical_name(self) -> str:
+        return f"{self.name}, {self.country}"
+
+    @property
+    def age_seconds(self) -> float:
+        return (datetime.now() - self.fetched_at).total_seconds()
+
 class FlightOption(BaseModel):
     """Flight option data model."""
     departure_time: str = Field(..., description="Departure time in HH:MM format")
@@ -53,14 +81,43 @@ class HotelOption(BaseModel):
                 amenities=amenities
             )
         except Exception as e:
-            print(f"Error parsing hotel data: {e}")
-            print(f"Raw data: {data}")
+            logger.warning("hotel_parse_error", error=str(e), data=data)
             raise
 
+    @classmethod
+    def list_from_api_response(cls, items: List[dict]) -> List["HotelOption"]:
+        """
+        Validate a whole list in one call, cleaning up item by item (prices
+        like "$1,200", out-of-range ratings) only if that fails.
+        """
+        try:
+            return list_adapter(cls).validate_python(items)
+        except ValidationError:
+            return [cls.from_api_response(item) for item in items]
+
+@lru_cache(maxsize=None)
+def list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """TypeAdapter for List[model], to validate or serialize a whole list in one call."""
+    return TypeAdapter(List[model])
+
+class FlightSearchResult(BaseModel):
+    """Structured-output envelope of a flight search completion."""
+    flights: List[FlightOption] = Field(..., description="Flight options, empty if the route is unrealistic")
+
+class HotelSearchResult(BaseModel):
+    """Structured-output envelope of a hotel search completion."""
+    hotels: List[HotelOption] = Field(..., description="Hotel options, empty if the city is unsuitable")
+
+class CombinedSearchResult(BaseModel):
+    """Structured-output envelope of a fused flight and hotel search completion."""
+    flights: List[FlightOption] = Field(..., description="Flight options, empty if the route is unrealistic")
+    hotels: List[HotelOption] = Field(..., description="Hotel options at the destination")
+
 class ServiceStatus(BaseModel):
     """Status information for a service."""
     status: bool = Field(default=False, description="Whether the service is working")
     error: Optional[str] = Field(default=None, description="Error message if service failed")
+    timed_out: bool = Field(default=False, description="Whether the service missed its deadline")
 
 class TravelPlan(BaseModel):
     """Complete travel plan combining all components."""
@@ -81,4 +138,58 @@ class TravelPlan(BaseModel):
         arbitrary_types_allowed = True
         json_encoders = {
             datetime: lambda v: v.isoformat()
-        }
\ No newline at end of file
+        }
+
+class ServiceUpdate(BaseModel):
+    """Partial result emitted as soon as one service finishes, fails or times out."""
+    service: str = Field(..., description="Service name: weather, flights or hotels")
+    status: ServiceStatus = Field(default_factory=ServiceStatus)
+    partial: bool = Field(default=False, description="True for options streamed before the service finished")
+    weather_forecast: Optional[WeatherForecast] = None
+    flight_options: Optional[List[FlightOption]] = None
+    hotel_options: Optional[List[HotelOption]] = None
+
+class PlanCompleted(BaseModel):
+    """Final event of a plan stream, carrying the assembled plan."""
+    plan: TravelPlan
+
+PlanEvent = Union[ServiceUpdate, PlanCompleted]
+
+class DateOption(BaseModel):
+    """Flights and hotels for one day of a date-range search."""
+    date: str = Field(..., description="Travel date in YYYY-MM-DD format")
+    flight_options: List[FlightOption] = Field(default_factory=list)
+    hotel_options: List[HotelOption] = Field(default_factory=list)
+    cheapest_flight: Optional[FlightOption] = None
+    cheapest_hotel: Optional[HotelOption] = None
+    total_price: Optional[float] = Field(
+        default=None, description="Cheapest flight plus one night at the cheapest hotel, in USD")
+    rank: Optional[int] = Field(default=None, description="1 for the cheapest day; None if it has no price")
+    service_status: Dict[str, ServiceStatus] = Field(default_factory=dict)
+
+class DateRangePlan(BaseModel):
+    """Calendar of per-day options for a route, with shared weather."""
+    origin: str
+    destination: str
+    date_from: str
+    date_to: str
+    weather_forecast: WeatherForecast = Field(default_factory=WeatherForecast)
+    weather_status: ServiceStatus = Field(default_factory=ServiceStatus)
+    dates: List[DateOption] = Field(default_factory=list, description="One entry per day, in date order")
+    created_at: datetime = Field(default_factory=datetime.now)
+
+    def ranked(self) -> List[DateOption]:
+        """Days with a price, cheapest first."""
+        return sorted((d for d in self.dates if d.rank is not None), key=lambda d: d.rank)
+
+class BatchResult(BaseModel):
+    """One line of batch output: the query and either its plan or an error."""
+    index: int
+    origin: str
+    destination: str
+    date: str
+    plan: Optional[TravelPlan] = None
+    error: Optional[str] = None
+
+    def to_json(self) -> str:
+        return self.model_dump_json(exclude={"error"} if self.error is None else {"plan"})
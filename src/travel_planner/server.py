@@ -0,0 +1,316 @@
+import argparse
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Union
+
+import openai
+from aiohttp import web
+from pydantic import BaseModel, ValidationError
+
+from .agents.flight_agent import FlightAgent
+from .agents.hotel_agent import HotelAgent
+from .agents.travel_planner_agent import TravelPlannerAgent
+from .agents.weather_agent import WeatherAgent
+from .config import get_settings
+from .schemas.models import list_adapter
+from .utils.circuit_breaker import circuit_stats
+from .utils.exceptions import CityValidationError, ServiceError
+from .utils.http import close_http_client
+from .utils.llm_gateway import close_llm_gateway, get_llm_gateway
+from .utils.logger import logger
+from .utils.metrics import get_metrics
+from .utils.dates import validate_travel_date
+from .warmer import RouteWarmer, load_routes
+
+PLANNER_KEY = web.AppKey("travel_planner", TravelPlannerAgent)
+WARMER_KEY = web.AppKey("route_warmer", RouteWarmer)
+WARM_ROUTES_KEY = web.AppKey("warm_routes_file", str)
+
+
+class Overloaded(Exception):
+    """Raised when both the in-flight limit and the wait queue are full."""
+    pass
+
+
+class AdmissionController:
+    """
+    Bound the number of requests being planned and waiting to be planned.
+
+    Up to max_inflight requests run at once and up to max_queue more wait for
+    a slot; anything beyond that is rejected immediately so the server sheds
+    load instead of building an unbounded backlog.
+    """
+
+    def __init__(self, max_inflight: int, max_queue: int):
+        self.max_inflight = max_inflight
+        self.max_queue = max_queue
+        self._slots = asyncio.Semaphore(max_inflight)
+        self.inflight = 0
+        self.waiting = 0
+        self.rejected = 0
+
+    @asynccontextmanager
+    async def admit(self):
+        if self._slots.locked() and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise Overloaded()
+
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        self.inflight += 1
+        try:
+            yield
+        finally:
+            self.inflight -= 1
+            self._slots.release()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "inflight": self.inflight,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+            "max_inflight": self.max_inflight,
+            "max_queue": self.max_queue,
+        }
+
+
+ADMISSION_KEY = web.AppKey("admission", AdmissionController)
+
+
+def _require(request: web.Request, *names: str) -> List[str]:
+    values = []
+    for name in names:
+        value = request.query.get(name, "").strip()
+        if not value:
+            raise web.HTTPBadRequest(
+                text=json.dumps({"error": f"Missing query parameter: {name}"}),
+                content_type="application/json")
+        values.append(value)
+    return values
+
+
+def _travel_date(request: web.Request) -> str:
+    date = request.query.get("date") or (datetime.now() + timedelta(days=7)).strftime("%Y-%m-%d")
+    try:
+        return validate_travel_date(date)
+    except ValueError as e:
+        raise web.HTTPBadRequest(
+            text=json.dumps({"error": str(e)}), content_type="application/json")
+
+
+def _error(status: int, message: str) -> web.Response:
+    return web.json_response({"error": message}, status=status)
+
+
+def _model_response(result: Union[BaseModel, List[BaseModel]]) -> web.Response:
+    """Serialize a model or list of models to JSON in one pydantic-core call."""
+    if isinstance(result, list):
+        body = list_adapter(type(result[0])).dump_json(result) if result else b"[]"
+    else:
+        body = result.model_dump_json().encode()
+    return web.Response(body=body, content_type="application/json")
+
+
+async def _run_service(planner: TravelPlannerAgent, service: str, call) -> web.Response:
+    """Run one sub-agent under its configured budget and map failures to HTTP errors."""
+    try:
+        result = await asyncio.wait_for(call, timeout=planner.service_timeouts[service])
+    except asyncio.TimeoutError:
+        return _error(504, f"{service.title()} service timed out")
+    except (json.JSONDecodeError, ValidationError) as e:
+        # Both are ValueErrors, but an unparseable upstream answer is not the client's fault
+        logger.error("upstream_response_invalid", service=service, error=str(e))
+        return _error(502, f"Invalid response from {service} service")
+    except (CityValidationError, ValueError) as e:
+        return _error(400, str(e))
+    except (ServiceError, openai.APIError) as e:
+        return _error(502, str(e))
+
+    return _model_response(result)
+
+
+async def plan_handler(request: web.Request) -> web.Response:
+    origin, destination = _require(request, "origin", "destination")
+    date = _travel_date(request)
+    warmer = request.app.get(WARMER_KEY)
+    if warmer is not None:
+        plan = await warmer.plan(origin, destination, date)
+    else:
+        plan = await request.app[PLANNER_KEY].execute(origin, destination, date)
+    return _model_response(plan)
+
+
+async def plan_range_handler(request: web.Request) -> web.Response:
+    """Search every day in a date range and return a price-ranked calendar."""
+    origin, destination, date_from, date_to = _require(request, "origin", "destination", "date_from", "date_to")
+    try:
+        validate_travel_date(date_from)
+        validate_travel_date(date_to)
+        plan = await request.app[PLANNER_KEY].execute_range(origin, destination, date_from, date_to)
+    except (CityValidationError, ValueError) as e:
+        return _error(400, str(e))
+    except ServiceError as e:
+        return _error(502, str(e))
+    return _model_response(plan)
+
+
+async def plan_stream_handler(request: web.Request) -> web.StreamResponse:
+    """Stream plan events as newline-delimited JSON as each service finishes."""
+    origin, destination = _require(request, "origin", "destination")
+    date = _travel_date(request)
+    response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+    await response.prepare(request)
+    async for event in request.app[PLANNER_KEY].stream(origin, destination, date):
+        await response.write((event.model_dump_json() + "\n").encode())
+    await response.write_eof()
+    return response
+
+
+async def weather_handler(request: web.Request) -> web.Response:
+    planner = request.app[PLANNER_KEY]
+    destination, = _require(request, "destination")
+    return await _run_service(
+        planner, "weather", planner.weather_agent.execute(destination, _travel_date(request)))
+
+
+async def flights_handler(request: web.Request) -> web.Response:
+    planner = request.app[PLANNER_KEY]
+    origin, destination = _require(request, "origin", "destination")
+    return await _run_service(
+        planner, "flights", planner.flight_agent.execute(origin, destination, _travel_date(request)))
+
+
+async def hotels_handler(request: web.Request) -> web.Response:
+    planner = request.app[PLANNER_KEY]
+    city, = _require(request, "city")
+    return await _run_service(
+        planner, "hotels", planner.hotel_agent.execute(city, _travel_date(request)))
+
+
+async def health_handler(request: web.Request) -> web.Response:
+    upstreams = circuit_stats()
+    degraded = any(c["state"] != "closed" for c in upstreams["circuits"].values())
+    health = {
+        "status": "degraded" if degraded else "ok",
+        "admission": request.app[ADMISSION_KEY].stats(),
+        "llm_gateway": get_llm_gateway().stats(),
+        "upstreams": upstreams,
+        "metrics": get_metrics().snapshot()
+    }
+    warmer = request.app.get(WARMER_KEY)
+    if warmer is not None:
+        health["route_warmer"] = warmer.stats()
+    return web.json_response(health)
+
+
+async def metrics_handler(request: web.Request) -> web.Response:
+    """Expose stage latencies, counters and cache lookups for Prometheus."""
+    return web.Response(
+        text=get_metrics().to_prometheus(),
+        content_type="text/plain",
+        headers={"X-Content-Type-Options": "nosniff"}
+    )
+
+
+@web.middleware
+async def admission_middleware(request: web.Request, handler):
+    """Apply admission control to every endpoint except health and metrics."""
+    if request.path in ("/health", "/metrics"):
+        return await handler(request)
+    try:
+        async with request.app[ADMISSION_KEY].admit():
+            return await handler(request)
+    except Overloaded:
+        logger.warning("request_rejected", path=request.path)
+        return web.json_response(
+            {"error": "Server is at capacity, please retry"},
+            status=503,
+            headers={"Retry-After": "1"})
+
+
+async def _build_agents(app: web.Application) -> None:
+    """Build the agents and their clients once for the lifetime of the server."""
+    app[PLANNER_KEY] = TravelPlannerAgent(
+        weather_agent=WeatherAgent(),
+        flight_agent=FlightAgent(),
+        hotel_agent=HotelAgent()
+    )
+    if app[WARM_ROUTES_KEY]:
+        warmer = RouteWarmer(app[PLANNER_KEY], load_routes(app[WARM_ROUTES_KEY]))
+        warmer.start()
+        app[WARMER_KEY] = warmer
+    logger.info("server_started")
+
+
+async def _close_clients(app: web.Application) -> None:
+    if WARMER_KEY in app:
+        await app[WARMER_KEY].stop()
+    await close_llm_gateway()
+    await close_http_client()
+    logger.info("server_stopped")
+
+
+def create_app(
+    max_inflight: Optional[int] = None,
+    max_queue: Optional[int] = None,
+    warm_routes_file: Optional[str] = None
+) -> web.Application:
+    """Create the HTTP application; agents are built on startup and reused for every request."""
+    settings = get_settings()
+    app = web.Application(middlewares=[admission_middleware])
+    app[ADMISSION_KEY] = AdmissionController(
+        max_inflight=max_inflight or settings.server_max_inflight,
+        max_queue=settings.server_max_queue if max_queue is None else max_queue
+    )
+    app[WARM_ROUTES_KEY] = settings.warm_routes_file if warm_routes_file is None else warm_routes_file
+    app.on_startup.append(_build_agents)
+    app.on_cleanup.append(_close_clients)
+    app.router.add_get("/plan", plan_handler)
+    app.router.add_get("/plan/stream", plan_stream_handler)
+    app.router.add_get("/plan/range", plan_range_handler)
+    app.router.add_get("/weather", weather_handler)
+    app.router.add_get("/flights", flights_handler)
+    app.router.add_get("/hotels", hotels_handler)
+    app.router.add_get("/health", health_handler)
+    app.router.add_get("/metrics", metrics_handler)
+    return app
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(
+        prog="python -m travel_planner serve",
+        description="Run the travel planner as a long-running HTTP service"
+    )
+    parser.add_argument("--host", default=settings.server_host,
+                        help=f"Interface to bind (default: {settings.server_host})")
+    parser.add_argument("--port", type=int, default=settings.server_port,
+                        help=f"Port to listen on (default: {settings.server_port})")
+    parser.add_argument("--max-inflight", type=int, default=settings.server_max_inflight,
+                        help="Maximum requests processed at once")
+    parser.add_argument("--max-queue", type=int, default=settings.server_max_queue,
+                        help="Maximum requests waiting for a slot before new ones are rejected")
+    parser.add_argument("--warm-routes", default=settings.warm_routes_file,
+                        help="CSV/JSONL file of popular routes to keep precomputed and refreshed")
+    args = parser.parse_args(argv)
+
+    # run_app handles SIGINT/SIGTERM: it stops accepting connections, lets
+    # in-flight requests finish within the shutdown timeout, then runs cleanup
+    web.run_app(
+        create_app(
+            max_inflight=args.max_inflight,
+            max_queue=args.max_queue,
+            warm_routes_file=args.warm_routes
+        ),
+        host=args.host,
+        port=args.port,
+        shutdown_timeout=settings.server_shutdown_timeout,
+        print=None
+    )
+    return 0
@@ -0,0 +1,254 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Iterator, Optional, Tuple
+
+from ..config import get_settings
+from .exceptions import ServiceError
+from .logger import logger
+from .metrics import get_metrics
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# How each upstream is named in errors shown to users
+UPSTREAM_NAMES = {"weather": "Weather service", "openai": "OpenAI"}
+
+
+class CircuitOpenError(ServiceError):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+    def __init__(self, upstream: str, retry_in: float):
+        self.upstream = upstream
+        self.retry_in = retry_in
+        super().__init__(
+            f"{UPSTREAM_NAMES.get(upstream, upstream)} is currently unavailable; "
+            f"not retrying for another {retry_in:.0f}s")
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker for one upstream.
+
+    Outcomes of the last `window` calls are kept. Once at least `min_calls`
+    have been seen, the circuit opens when the share of failures or of calls
+    slower than `slow_call_seconds` reaches its threshold. While open, calls
+    fail immediately with CircuitOpenError. After `open_seconds` up to
+    `half_open_calls` probe calls are let through: if they all succeed the
+    circuit closes, if any fails it opens again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float,
+        slow_call_rate: float,
+        slow_call_seconds: float,
+        window: int,
+        min_calls: int,
+        open_seconds: float,
+        half_open_calls: int
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.slow_call_rate = slow_call_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.state = CLOSED
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        self.rejected = 0
+
+    def _transition(self, state: str) -> None:
+        if state == self.state:
+            return
+        logger.warning("circuit_state_changed", upstream=self.name, previous=self.state, state=state)
+        get_metrics().inc("circuit_transitions_total", upstream=self.name, state=state)
+        self.state = state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        if state in (OPEN, HALF_OPEN):
+            self._probes = 0
+            self._probe_successes = 0
+        if state == CLOSED:
+            self._outcomes.clear()
+
+    def _record(self, ok: bool, slow: bool) -> None:
+        if self.state == HALF_OPEN:
+            if not ok or slow:
+                self._transition(OPEN)
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_calls:
+                self._transition(CLOSED)
+            return
+
+        self._outcomes.append((ok, slow))
+        if self.state != CLOSED or len(self._outcomes) < self.min_calls:
+            return
+        calls = len(self._outcomes)
+        failures = sum(1 for ok, _ in self._outcomes if not ok)
+        slow_calls = sum(1 for _, slow in self._outcomes if slow)
+        if failures / calls >= self.failure_rate or slow_calls / calls >= self.slow_call_rate:
+            self._transition(OPEN)
+
+    def check(self) -> None:
+        """Raise CircuitOpenError while open, before any work is queued for the call."""
+        if self.state == OPEN:
+            remaining = self._opened_at + self.open_seconds - time.monotonic()
+            if remaining > 0:
+                self.rejected += 1
+                get_metrics().inc("circuit_rejected_total", upstream=self.name)
+                raise CircuitOpenError(self.name, remaining)
+
+    def _before_call(self) -> None:
+        if self.state == OPEN:
+            self.check()
+            self._transition(HALF_OPEN)
+        if self.state == HALF_OPEN:
+            if self._probes >= self.half_open_calls:
+                self.rejected += 1
+                get_metrics().inc("circuit_rejected_total", upstream=self.name)
+                raise CircuitOpenError(self.name, 0)
+            self._probes += 1
+
+    @contextmanager
+    def guard(self, is_failure: Callable[[BaseException], bool] = lambda e: True) -> Iterator[None]:
+        """
+        Run one upstream call under the breaker.
+
+        Raises CircuitOpenError without running the block while the circuit
+        is open. Exceptions for which is_failure returns False (e.g. a 4xx
+        answer) count as successful calls, since the upstream responded.
+        """
+        self._before_call()
+        start = time.monotonic()
+        try:
+            yield
+        except asyncio.CancelledError:
+            # A caller's deadline cut the call short; it only says something
+            # about the upstream if it had already been slow
+            duration = time.monotonic() - start
+            if duration >= self.slow_call_seconds:
+                self._record(ok=True, slow=True)
+            elif self.state == HALF_OPEN:
+                self._probes -= 1
+            raise
+        except BaseException as e:
+            self._record(ok=not is_failure(e), slow=time.monotonic() - start >= self.slow_call_seconds)
+            raise
+        else:
+            self._record(ok=True, slow=time.monotonic() - start >= self.slow_call_seconds)
+
+    def stats(self) -> Dict[str, object]:
+        calls = len(self._outcomes)
+        return {
+            "state": self.state,
+            "window_calls": calls,
+            "failure_rate": round(sum(1 for ok, _ in self._outcomes if not ok) / calls, 3) if calls else 0.0,
+            "slow_call_rate": round(sum(1 for _, slow in self._outcomes if slow) / calls, 3) if calls else 0.0,
+            "rejected": self.rejected,
+        }
+
+
+class RetryBudget:
+    """
+    Allowance for extra attempts, e.g. the process-wide retry budget shared
+    by every upstream.
+
+    Each first attempt deposits `ratio` tokens and each retry spends one, so
+    retries can add at most `ratio` extra load however many calls fail. A
+    small floor of `min_per_second` retries keeps low-traffic processes able
+    to ride out a single blip.
+    """
+
+    def __init__(self, ratio: float, min_per_second: float, max_balance: float = 100.0, name: str = "retry"):
+        self.name = name
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_balance = max_balance
+        self._balance = 0.0
+        self._floor = min_per_second
+        self._updated = time.monotonic()
+        self.requests = 0
+        self.retries = 0
+        self.denied = 0
+
+    def record_request(self) -> None:
+        self.requests += 1
+        self._balance = min(self.max_balance, self._balance + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget; False means the caller should give up."""
+        now = time.monotonic()
+        self._floor = min(self.min_per_second, self._floor + (now - self._updated) * self.min_per_second)
+        self._updated = now
+        if self._balance >= 1:
+            self._balance -= 1
+        elif self._floor >= 1:
+            self._floor -= 1
+        else:
+            self.denied += 1
+            get_metrics().inc("budget_denied_total", budget=self.name)
+            return False
+        self.retries += 1
+        return True
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "denied": self.denied,
+            "balance": round(self._balance, 2),
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_retry_budget: Optional[RetryBudget] = None
+
+
+def get_circuit_breaker(upstream: str) -> CircuitBreaker:
+    """Return the process-wide circuit breaker for an upstream ("weather" or "openai")."""
+    breaker = _breakers.get(upstream)
+    if breaker is None:
+        settings = get_settings()
+        slow_call_seconds = {
+            "weather": settings.circuit_weather_slow_call_seconds,
+            "openai": settings.circuit_openai_slow_call_seconds,
+        }[upstream]
+        breaker = _breakers[upstream] = CircuitBreaker(
+            name=upstream,
+            failure_rate=settings.circuit_failure_rate,
+            slow_call_rate=settings.circuit_slow_call_rate,
+            slow_call_seconds=slow_call_seconds,
+            window=settings.circuit_window,
+            min_calls=settings.circuit_min_calls,
+            open_seconds=settings.circuit_open_seconds,
+            half_open_calls=settings.circuit_half_open_calls
+        )
+    return breaker
+
+
+def get_retry_budget() -> RetryBudget:
+    """Return the retry budget shared by all upstream calls."""
+    global _retry_budget
+    if _retry_budget is None:
+        settings = get_settings()
+        _retry_budget = RetryBudget(
+            ratio=settings.retry_budget_ratio,
+            min_per_second=settings.retry_budget_min_per_second
+        )
+    return _retry_budget
+
+
+def circuit_stats() -> Dict[str, object]:
+    return {
+        "circuits": {name: breaker.stats() for name, breaker in _breakers.items()},
+        "retry_budget": get_retry_budget().stats(),
+    }
@@ -0,0 +1,25 @@
+from datetime import datetime, timedelta
+from typing import List
+
+
+def validate_travel_date(date_str: str) -> str:
+    """Validate YYYY-MM-DD format and that the date is within the next year."""
+    date = datetime.strptime(date_str, "%Y-%m-%d").date()
+    today = datetime.now().date()
+    if date < today:
+        raise ValueError("Date cannot be in the past")
+    if date > today + timedelta(days=365):
+        raise ValueError("Date cannot be more than 1 year in the future")
+    return date_str
+
+
+def date_range(date_from: str, date_to: str, max_days: int) -> List[str]:
+    """Return every YYYY-MM-DD date from date_from to date_to inclusive."""
+    start = datetime.strptime(date_from, "%Y-%m-%d").date()
+    end = datetime.strptime(date_to, "%Y-%m-%d").date()
+    if end < start:
+        raise ValueError("End date cannot be before start date")
+    days = (end - start).days + 1
+    if days > max_days:
+        raise ValueError(f"Date range cannot be longer than {max_days} days")
+    return [(start + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(days)]
@@ -0,0 +1,51 @@
+import asyncio
+from typing import Optional
+
+import httpx
+
+from ..config import get_settings
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _build_client() -> httpx.AsyncClient:
+    settings = get_settings()
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(settings.http_timeout),
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+        ),
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Return the process-wide pooled HTTP client.
+
+    The connection pool is bound to the event loop that created it, so a new
+    client is built if the running loop changes (e.g. successive asyncio.run calls).
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = _build_client()
+        _client_loop = loop
+    return _client
+
+
+def set_http_client(client: httpx.AsyncClient) -> None:
+    """Install a preconfigured client, e.g. one with a mock transport for benchmarks."""
+    global _client, _client_loop
+    _client = client
+    _client_loop = asyncio.get_running_loop()
+
+
+async def close_http_client() -> None:
+    """Close the shared client and release its pooled connections."""
+    global _client, _client_loop
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
@@ -0,0 +1,66 @@
+import json
+from typing import Any, Dict, List, Optional
+
+
+class JSONArrayStreamParser:
+    """
+    Incrementally extract the elements of one top-level array from streamed JSON.
+
+    Feed text chunks as they arrive; each call returns the objects of the
+    array named `key` that were completed by that chunk, e.g. the entries of
+    {"flights": [...]} one by one while the completion is still generating.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string: List[str] = []
+        self._last_string: Optional[str] = None
+        self._array_depth: Optional[int] = None
+        self._element: List[str] = []
+        self.done = False
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        completed = []
+        for char in chunk:
+            capturing = self._array_depth is not None and self._depth > self._array_depth
+            if capturing:
+                self._element.append(char)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_string = "".join(self._string)
+                elif self._depth == 1:
+                    self._string.append(char)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string = []
+            elif char in "{[":
+                if (char == "[" and self._depth == 1 and self._array_depth is None
+                        and not self.done and self._last_string == self.key):
+                    self._array_depth = self._depth + 1
+                self._depth += 1
+                if self._array_depth is not None and self._depth == self._array_depth + 1 and not capturing:
+                    self._element = [char]
+            elif char in "}]":
+                self._depth -= 1
+                if self._array_depth is not None:
+                    if self._depth == self._array_depth and capturing:
+                        completed.append(json.loads("".join(self._element)))
+                        self._element = []
+                    elif self._depth < self._array_depth:
+                        self._array_depth = None
+                        self.done = True
+            elif char == "," and self._depth == 1:
+                self._last_string = None
+        return completed
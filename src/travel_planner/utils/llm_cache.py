@@ -0,0 +1,169 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from ..config import get_settings
+from ..schemas.models import list_adapter
+from .cache import TTLCache
+from .logger import logger
+from .metrics import get_metrics
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class SQLiteCacheBackend:
+    """
+    On-disk key/value store for cached LLM results.
+
+    Rows carry an expiry time and a byte size; once the total size passes
+    max_bytes the least recently accessed rows are deleted.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                payload BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            payload, expires_at = row
+            if expires_at <= now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return payload
+
+    def set(self, key: str, payload: bytes, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now + ttl, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall():
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class LLMResponseCache:
+    """
+    Two-level cache of parsed LLM results keyed on the full request.
+
+    The in-memory LRU front holds the parsed model lists, so a hit skips both
+    the completion and JSON parsing. The SQLite backend persists results
+    across processes; disk reads run in a worker thread to keep the event
+    loop free.
+    """
+
+    def __init__(self, backend: Optional[SQLiteCacheBackend], memory_size: int, default_ttl: float):
+        self.backend = backend
+        self.memory = TTLCache(maxsize=memory_size, default_ttl=default_ttl)
+        self.default_ttl = default_ttl
+
+    async def get(self, key: str, model: Type[M]) -> Optional[List[M]]:
+        metrics = get_metrics()
+        items = self.memory.get(key)
+        if items is not None:
+            metrics.cache_lookup("llm_memory", hit=True)
+            return list(items)
+        metrics.cache_lookup("llm_memory", hit=False)
+        if self.backend is None:
+            return None
+
+        try:
+            payload = await asyncio.to_thread(self.backend.get, key)
+        except sqlite3.Error as e:
+            logger.warning("llm_cache_read_error", error=str(e))
+            return None
+        metrics.cache_lookup("llm_disk", hit=payload is not None)
+        if payload is None:
+            return None
+
+        # One pydantic-core call straight from the stored bytes; rows that no
+        # longer match the model are treated as misses and overwritten
+        try:
+            items = list_adapter(model).validate_json(payload)
+        except ValidationError as e:
+            logger.warning("llm_cache_decode_error", error=str(e))
+            return None
+        self.memory.set(key, items)
+        return list(items)
+
+    async def set(self, key: str, items: List[BaseModel], ttl: Optional[float] = None) -> None:
+        ttl = self.default_ttl if ttl is None else ttl
+        self.memory.set(key, list(items), ttl=ttl)
+        if self.backend is None:
+            return
+
+        payload = list_adapter(type(items[0])).dump_json(items) if items else b"[]"
+        try:
+            await asyncio.to_thread(self.backend.set, key, payload, ttl)
+        except sqlite3.Error as e:
+            logger.warning("llm_cache_write_error", error=str(e))
+
+
+_llm_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Return the process-wide LLM response cache, or None if disabled."""
+    global _llm_cache
+    settings = get_settings()
+    if not settings.llm_cache_enabled:
+        return None
+    if _llm_cache is None:
+        backend = None
+        if settings.llm_cache_path:
+            backend = SQLiteCacheBackend(settings.llm_cache_path, settings.llm_cache_max_bytes)
+        _llm_cache = LLMResponseCache(
+            backend=backend,
+            memory_size=settings.llm_cache_memory_size,
+            default_ttl=settings.llm_cache_ttl
+        )
+    return _llm_cache
@@ -0,0 +1,424 @@
+import asyncio
+import random
+import re
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+
+import openai
+from openai import AsyncOpenAI
+
+from ..config import get_settings
+from .circuit_breaker import RetryBudget, get_circuit_breaker, get_retry_budget
+from .logger import logger
+from .metrics import Histogram, get_metrics
+
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+
+def is_outage(error: BaseException) -> bool:
+    """Whether an error says OpenAI is unhealthy, as opposed to a rate limit or a bad request."""
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code >= 500
+    return isinstance(error, (openai.APIConnectionError, asyncio.TimeoutError))
+
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_UNIT_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _parse_duration(value: str) -> Optional[float]:
+    """Parse OpenAI reset durations such as '20ms', '1.5s' or '6m0s' into seconds."""
+    parts = _DURATION.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _UNIT_SECONDS[unit] for amount, unit in parts)
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Return the server-suggested wait in seconds from rate-limit headers, if any."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    headers = response.headers
+
+    if "retry-after-ms" in headers:
+        try:
+            return float(headers["retry-after-ms"]) / 1000
+        except ValueError:
+            pass
+    if "retry-after" in headers:
+        try:
+            return float(headers["retry-after"])
+        except ValueError:
+            pass
+
+    resets = [
+        _parse_duration(headers[name])
+        for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+        if name in headers
+    ]
+    resets = [reset for reset in resets if reset is not None]
+    return max(resets) if resets else None
+
+
+class RateLimiter:
+    """
+    Token bucket refilled continuously at `per_minute` units per minute.
+
+    Waiters are served in arrival order. The balance may go negative when a
+    request turns out to cost more than estimated, which delays later work.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.tokens = per_minute
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float) -> None:
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def adjust(self, amount: float) -> None:
+        """Charge (positive) or refund (negative) units after the fact."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class PrefetchedStream:
+    """
+    A streaming completion whose first chunk has already been read.
+
+    The gateway waits for the first chunk before handing a stream back, so
+    time to first token is what retries, hedging and the circuit breaker see.
+    """
+
+    def __init__(self, stream, first: Optional[Any]):
+        self.stream = stream
+        self.first = first
+
+    async def __aenter__(self) -> "PrefetchedStream":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def __aiter__(self):
+        if self.first is not None:
+            yield self.first
+        async for chunk in self.stream:
+            yield chunk
+
+    async def close(self) -> None:
+        await self.stream.close()
+
+
+class LLMGateway:
+    """
+    Shared entry point for every chat completion made by the LLM agents.
+
+    Enforces requests-per-minute and tokens-per-minute budgets plus a
+    concurrency cap, queueing excess work rather than letting it hit provider
+    rate limits. Rate-limited and transient failures are retried with
+    jittered exponential backoff, honouring Retry-After and x-ratelimit-reset
+    headers when present, as long as the shared retry budget allows. Calls
+    go through the "openai" circuit breaker and fail fast while it is open.
+
+    With hedging enabled, an attempt that has not answered (or streamed its
+    first chunk) within the `hedge_percentile` of recent latency is raced
+    against a duplicate; the first to succeed wins and the other is
+    cancelled. Hedges are capped at `hedge_budget` extra requests and are
+    skipped while work is already queueing.
+    """
+
+    def __init__(
+        self,
+        client: AsyncOpenAI,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        max_concurrency: int = 16,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 20.0,
+        estimated_completion_tokens: int = 700,
+        hedging: bool = False,
+        hedge_percentile: float = 0.95,
+        hedge_min_delay: float = 0.5,
+        hedge_min_samples: int = 20,
+        hedge_budget: float = 0.05
+    ):
+        self.client = client
+        self.request_limiter = RateLimiter(requests_per_minute) if requests_per_minute else None
+        self.token_limiter = RateLimiter(tokens_per_minute) if tokens_per_minute else None
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.estimated_completion_tokens = estimated_completion_tokens
+        self.hedging = hedging
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_min_samples = hedge_min_samples
+        self._hedge_budget = RetryBudget(hedge_budget, min_per_second=0, name="hedge")
+        # Recent time to answer (or to first chunk), kept apart because the two differ a lot
+        self._latency = {"complete": Histogram(window=512), "stream": Histogram(window=512)}
+
+        self.queue_depth = 0
+        self.inflight = 0
+        self.requests = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def estimate_tokens(self, request: Dict[str, Any]) -> int:
+        """Rough token cost: ~4 characters per prompt token plus the expected completion."""
+        prompt_chars = sum(len(str(m.get("content", ""))) for m in request.get("messages", []))
+        completion = request.get("max_tokens") or self.estimated_completion_tokens
+        return prompt_chars // 4 + completion * request.get("n", 1)
+
+    @asynccontextmanager
+    async def _admit(self, tokens: int):
+        """Wait for rate-limit budget and a concurrency slot, recording the queueing delay."""
+        self.queue_depth += 1
+        start = time.monotonic()
+        try:
+            if self.request_limiter is not None:
+                await self.request_limiter.acquire(1)
+            if self.token_limiter is not None:
+                await self.token_limiter.acquire(tokens)
+            await self._slots.acquire()
+        finally:
+            self.queue_depth -= 1
+
+        waited = time.monotonic() - start
+        get_metrics().record_stage("llm_queue_wait", waited)
+        self.wait_time_total += waited
+        self.wait_time_max = max(self.wait_time_max, waited)
+        self.requests += 1
+        self.inflight += 1
+        try:
+            yield
+        finally:
+            self.inflight -= 1
+            self._slots.release()
+
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        hint = retry_after(error)
+        if hint is not None:
+            # Small jitter on top of the hint so waiting callers do not retry in lockstep
+            return hint + random.uniform(0, self.backoff_base)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def _attempt(self, request: Dict[str, Any], tokens: int):
+        """Make one request, returning once the answer or the first streamed chunk arrives."""
+        kind = "stream" if request.get("stream") else "complete"
+        async with self._admit(tokens):
+            started = time.monotonic()
+            try:
+                with get_circuit_breaker("openai").guard(is_failure=is_outage), \
+                        get_metrics().timer("llm_request"):
+                    response = await self.client.chat.completions.create(**request)
+                    if kind == "stream":
+                        try:
+                            first = await response.__anext__()
+                        except StopAsyncIteration:
+                            first = None
+                        except BaseException:
+                            await response.close()
+                            raise
+                        response = PrefetchedStream(response, first)
+            except RETRYABLE_ERRORS as e:
+                get_metrics().inc("llm_requests_total", result=type(e).__name__)
+                if isinstance(e, openai.RateLimitError):
+                    self.rate_limited += 1
+                raise
+
+        self._latency[kind].observe(time.monotonic() - started)
+        get_metrics().inc("llm_requests_total", result="ok")
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            get_metrics().inc("llm_tokens_total", usage.prompt_tokens, kind="prompt")
+            get_metrics().inc("llm_tokens_total", usage.completion_tokens, kind="completion")
+        if usage is not None and self.token_limiter is not None:
+            self.token_limiter.adjust(usage.total_tokens - tokens)
+        return response
+
+    def hedge_delay(self, kind: str) -> Optional[float]:
+        """Seconds to wait before hedging, or None until enough latencies have been seen."""
+        latency = self._latency[kind]
+        if latency.count < self.hedge_min_samples:
+            return None
+        return max(self.hedge_min_delay, latency.percentile(self.hedge_percentile))
+
+    @staticmethod
+    async def _discard(task: asyncio.Task) -> None:
+        """Cancel a losing attempt and release whatever it already holds."""
+        task.cancel()
+        try:
+            response = await task
+        except BaseException:
+            return
+        if isinstance(response, PrefetchedStream):
+            await response.close()
+
+    async def _hedged(self, request: Dict[str, Any], tokens: int):
+        kind = "stream" if request.get("stream") else "complete"
+        delay = self.hedge_delay(kind) if self.hedging else None
+        primary = asyncio.ensure_future(self._attempt(request, tokens))
+        if delay is None:
+            return await primary
+
+        tasks = [primary]
+        winner = None
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            # A hedge while requests are queueing only adds to the queue
+            if done or self.queue_depth or not self._hedge_budget.try_spend():
+                if not done:
+                    get_metrics().inc("llm_hedges_total", result="skipped")
+                winner = primary
+                return await primary
+
+            self.hedges += 1
+            get_metrics().inc("llm_hedges_total", result="issued")
+            logger.info("llm_hedge", kind=kind, delay=round(delay, 3))
+            tasks.append(asyncio.ensure_future(self._attempt(request, tokens)))
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in tasks:
+                    if task in done and task.exception() is None:
+                        winner = task
+                        won = task is not primary
+                        self.hedge_wins += won
+                        get_metrics().inc("llm_hedges_total", result="won" if won else "lost")
+                        return task.result()
+            # Both attempts failed; surface the primary's error to the retry loop
+            winner = primary
+            return primary.result()
+        finally:
+            await asyncio.gather(*(self._discard(task) for task in tasks if task is not winner))
+
+    async def _call(self, request: Dict[str, Any]):
+        tokens = self.estimate_tokens(request)
+        breaker = get_circuit_breaker("openai")
+        budget = get_retry_budget()
+        budget.record_request()
+        self._hedge_budget.record_request()
+        attempt = 0
+        while True:
+            # Fail fast rather than queue for a slot while OpenAI is known to be down
+            breaker.check()
+            try:
+                return await self._hedged(request, tokens)
+            except RETRYABLE_ERRORS as e:
+                # Retries come out of the shared budget so they cannot multiply an outage
+                if attempt >= self.max_retries or not budget.try_spend():
+                    raise
+                delay = self._retry_delay(attempt, e)
+                logger.warning("llm_retry", attempt=attempt + 1, delay=round(delay, 2), error=str(e))
+
+            self.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def complete(self, **request: Any):
+        """Create a chat completion within the shared budgets."""
+        return await self._call(request)
+
+    async def stream(self, **request: Any):
+        """Open a streaming chat completion within the shared budgets."""
+        return await self._call({**request, "stream": True})
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.queue_depth,
+            "inflight": self.inflight,
+            "requests": self.requests,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "wait_time_avg": self.wait_time_total / self.requests if self.requests else 0.0,
+            "wait_time_max": self.wait_time_max,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+        }
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_llm_gateway() -> LLMGateway:
+    """
+    Return the process-wide gateway shared by all LLM agents.
+
+    Its OpenAI connection pool and rate-limit locks are bound to the event
+    loop that first uses them, so a new gateway is built if the running loop
+    changes (e.g. successive asyncio.run calls).
+    """
+    global _gateway, _gateway_loop
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if _gateway is not None and loop is not None:
+        if _gateway_loop is None:
+            _gateway_loop = loop
+        elif _gateway_loop is not loop:
+            _gateway = None
+    if _gateway is None:
+        _gateway_loop = loop
+        settings = get_settings()
+        _gateway = LLMGateway(
+            # Retries are handled by the gateway so they count against its budgets
+            client=AsyncOpenAI(
+                api_key=settings.openai_api_key,
+                base_url=settings.openai_base_url,
+                max_retries=0
+            ),
+            requests_per_minute=settings.llm_requests_per_minute,
+            tokens_per_minute=settings.llm_tokens_per_minute,
+            max_concurrency=settings.llm_max_concurrency,
+            max_retries=settings.llm_max_retries,
+            backoff_base=settings.llm_backoff_base,
+            backoff_max=settings.llm_backoff_max,
+            estimated_completion_tokens=settings.llm_estimated_completion_tokens,
+            hedging=settings.llm_hedging,
+            hedge_percentile=settings.llm_hedge_percentile,
+            hedge_min_delay=settings.llm_hedge_min_delay,
+            hedge_min_samples=settings.llm_hedge_min_samples,
+            hedge_budget=settings.llm_hedge_budget
+        )
+    return _gateway
+
+
+async def close_llm_gateway() -> None:
+    """Close the shared gateway's client, if one was created."""
+    global _gateway, _gateway_loop
+    if _gateway is not None:
+        await _gateway.close()
+        _gateway = None
+    _gateway_loop = None
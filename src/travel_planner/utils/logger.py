@@ -1,3 +1,8 @@
+import sys
+
 import structlog
 
+# Log to stderr so JSON and JSONL output on stdout stays machine-readable
+structlog.configure(logger_factory=structlog.PrintLoggerFactory(file=sys.stderr))
+
 logger = structlog.get_logger()
@@ -0,0 +1,203 @@
+import bisect
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+# Latency buckets in seconds, Prometheus-style upper bounds
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# Per-plan stage timings; set by collect_timings and shared with the tasks started inside it
+_plan_timings: ContextVar[Optional[Dict[str, Dict[str, float]]]] = ContextVar(
+    "plan_timings", default=None)
+
+
+def _labels(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+class Histogram:
+    """
+    Latency histogram with cumulative buckets for export and a window of
+    recent samples for percentiles.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, window: int = 2048):
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._recent: Deque[float] = deque(maxlen=window)
+
+    def observe(self, value: float) -> None:
+        self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self._recent.append(value)
+
+    def percentile(self, q: float) -> float:
+        if not self._recent:
+            return 0.0
+        ordered = sorted(self._recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.sum / self.count * 1000, 2) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.50) * 1000, 2),
+            "p95_ms": round(self.percentile(0.95) * 1000, 2),
+            "p99_ms": round(self.percentile(0.99) * 1000, 2),
+        }
+
+
+class MetricsRegistry:
+    """
+    In-process counters and latency histograms.
+
+    Metrics are keyed by name plus labels. `timer` also adds the duration
+    to the per-plan breakdown when called inside `collect_timings`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def inc(self, name: str, amount: float = 1, **labels: str) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def record_stage(self, stage: str, seconds: float) -> None:
+        """Record one stage duration globally and in the current plan's breakdown."""
+        self.observe("stage_seconds", seconds, stage=stage)
+        timings = _plan_timings.get()
+        if timings is not None:
+            entry = timings.setdefault(stage, {"count": 0, "total_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] = round(entry["total_ms"] + seconds * 1000, 2)
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(stage, time.perf_counter() - start)
+
+    def cache_lookup(self, cache: str, hit: bool) -> None:
+        self.inc("cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+    def cache_ratios(self) -> Dict[str, float]:
+        totals: Dict[str, List[float]] = {}
+        with self._lock:
+            for (name, labels), value in self._counters.items():
+                if name != "cache_requests_total":
+                    continue
+                label_map = dict(labels)
+                hits_total = totals.setdefault(label_map["cache"], [0, 0])
+                hits_total[1] += value
+                if label_map["result"] == "hit":
+                    hits_total[0] += value
+        return {cache: round(hits / total, 4) for cache, (hits, total) in totals.items() if total}
+
+    def snapshot(self) -> Dict[str, dict]:
+        with self._lock:
+            histograms = {
+                name + _format_labels(labels): histogram.summary()
+                for (name, labels), histogram in sorted(self._histograms.items())
+            }
+            counters = {
+                name + _format_labels(labels): value
+                for (name, labels), value in sorted(self._counters.items())
+            }
+        return {"histograms": histograms, "counters": counters, "cache_hit_ratio": self.cache_ratios()}
+
+    def to_prometheus(self, prefix: str = "travel_planner") -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            seen = set()
+            for (name, labels), value in sorted(self._counters.items()):
+                metric = f"{prefix}_{name}"
+                if metric not in seen:
+                    seen.add(metric)
+                    lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric}{_format_labels(labels)} {value:g}")
+
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                metric = f"{prefix}_{name}"
+                if metric not in seen:
+                    seen.add(metric)
+                    lines.append(f"# TYPE {metric} histogram")
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.bucket_counts):
+                    cumulative += count
+                    lines.append(f"{metric}_bucket{_format_labels(labels, ('le', f'{bound:g}'))} {cumulative}")
+                lines.append(f"{metric}_bucket{_format_labels(labels, ('le', '+Inf'))} {histogram.count}")
+                lines.append(f"{metric}_sum{_format_labels(labels)} {histogram.sum:.6f}")
+                lines.append(f"{metric}_count{_format_labels(labels)} {histogram.count}")
+
+            # Percentiles over the recent window, as gauges
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                metric = f"{prefix}_{name}_recent"
+                if metric not in seen:
+                    seen.add(metric)
+                    lines.append(f"# TYPE {metric} gauge")
+                for q in ("0.5", "0.95", "0.99"):
+                    value = histogram.percentile(float(q))
+                    lines.append(f"{metric}{_format_labels(labels, ('quantile', q))} {value:.6f}")
+
+        ratios = self.cache_ratios()
+        if ratios:
+            lines.append(f"# TYPE {prefix}_cache_hit_ratio gauge")
+            for cache, ratio in sorted(ratios.items()):
+                lines.append(f'{prefix}_cache_hit_ratio{{cache="{cache}"}} {ratio}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+
+@contextmanager
+def collect_timings() -> Iterator[Dict[str, Dict[str, float]]]:
+    """Collect a per-stage timing breakdown for everything run inside the block."""
+    timings: Dict[str, Dict[str, float]] = {}
+    token = _plan_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _plan_timings.reset(token)
+
+
+_metrics = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Return the process-wide metrics registry."""
+    return _metrics
@@ -1,10 +1,172 @@
+import atexit
+import inspect
+import random
+import sys
+import threading
+import time
+from collections import deque
 from contextlib import contextmanager
+from datetime import datetime, timezone
 from functools import wraps
-from typing import Any, Callable, Dict, Optional
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional, Tuple
+from uuid import uuid4
 
-import agentops
+from ..config import get_settings
+from .logger import logger
 
-from .config import get_settings
+if TYPE_CHECKING:
+    import agentops
+
+_SIMPLE_TYPES = (str, int, float, bool, type(None))
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _serializable(value: Any) -> Any:
+    return value if isinstance(value, _SIMPLE_TYPES) else str(value)
+
+
+def _summarize(result: Any) -> str:
+    """Cheap description of a return value; full results never go on the queue."""
+    if isinstance(result, (list, tuple)):
+        return f"{len(result)} items"
+    return type(result).__name__
+
+
+class EventExporter:
+    """
+    Buffer telemetry events in memory and send them to AgentOps in batches.
+
+    `submit` never blocks and never raises: once the buffer is past the
+    sampling threshold only a fraction of events is kept (errors are always
+    kept), and once it is full new events are dropped. A daemon thread drains
+    the buffer every `flush_interval` seconds, so AgentOps' blocking HTTP
+    calls never run on the event loop.
+    """
+
+    def __init__(
+        self,
+        max_queue: int,
+        batch_size: int,
+        flush_interval: float,
+        sample_threshold: float,
+        sample_rate: float
+    ):
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sample_above = int(max_queue * sample_threshold)
+        self.sample_rate = sample_rate
+        self._events: Deque[Tuple[str, Dict[str, Any]]] = deque()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.submitted = 0
+        self.sampled_out = 0
+        self.dropped = 0
+        self.exported = 0
+        self.discarded = 0
+        self.failed = 0
+
+    def submit(self, kind: str, payload: Dict[str, Any], important: bool = False) -> bool:
+        with self._lock:
+            depth = len(self._events)
+            if depth >= self.max_queue:
+                self.dropped += 1
+                return False
+            if depth >= self.sample_above and not important and random.random() >= self.sample_rate:
+                self.sampled_out += 1
+                return False
+            self._events.append((kind, payload))
+            self.submitted += 1
+            if self._thread is None:
+                self._start()
+        if depth + 1 >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def _start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="monitoring-exporter", daemon=True)
+        self._thread.start()
+
+    def _take(self) -> List[Tuple[str, Dict[str, Any]]]:
+        with self._lock:
+            count = min(self.batch_size, len(self._events))
+            return [self._events.popleft() for _ in range(count)]
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        """Export everything currently buffered."""
+        batch = self._take()
+        while batch:
+            self._export(batch)
+            batch = self._take()
+
+    def _export(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        # Nothing can have started an AgentOps session if the SDK was never imported
+        if "agentops" not in sys.modules:
+            self.discarded += len(batch)
+            return
+        import agentops
+
+        try:
+            client = agentops.Client()
+            if not client.has_sessions or client.is_multi_session:
+                # No session to attach events to; AgentOps would only warn
+                self.discarded += len(batch)
+                return
+        except Exception:
+            self.discarded += len(batch)
+            return
+
+        for kind, payload in batch:
+            try:
+                if kind == "agent":
+                    agentops.create_agent(name=payload["name"], agent_id=payload["agent_id"])
+                elif payload.get("error"):
+                    agentops.record(agentops.ErrorEvent(
+                        trigger_event=agentops.ToolEvent(
+                            name=payload["name"],
+                            params=payload["params"],
+                            agent_id=payload["agent_id"],
+                            init_timestamp=payload["started_at"],
+                            end_timestamp=payload["ended_at"]
+                        ),
+                        details=payload["error"]
+                    ))
+                else:
+                    agentops.record(agentops.ToolEvent(
+                        name=payload["name"],
+                        params=payload["params"],
+                        returns=payload["returns"],
+                        agent_id=payload["agent_id"],
+                        init_timestamp=payload["started_at"],
+                        end_timestamp=payload["ended_at"]
+                    ))
+                self.exported += 1
+            except Exception as e:
+                self.failed += 1
+                logger.debug("monitoring_export_error", kind=kind, error=str(e))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            depth = len(self._events)
+        return {
+            "queued": depth,
+            "submitted": self.submitted,
+            "sampled_out": self.sampled_out,
+            "dropped": self.dropped,
+            "exported": self.exported,
+            "discarded": self.discarded,
+            "failed": self.failed,
+        }
 
 
 class MonitoringConfig:
@@ -12,23 +174,41 @@ class MonitoringConfig:
 
     def __init__(self):
         self._initialized = False
-        self._enabled = True
-        self.settings = get_settings()
+        self._enabled: Optional[bool] = None
         self._active_session = None
+        self._exporter: Optional[EventExporter] = None
+
+    @property
+    def exporter(self) -> EventExporter:
+        # Built on first use so importing the agents does not load settings
+        if self._exporter is None:
+            settings = get_settings()
+            self._exporter = EventExporter(
+                max_queue=settings.monitoring_queue_size,
+                batch_size=settings.monitoring_batch_size,
+                flush_interval=settings.monitoring_flush_interval,
+                sample_threshold=settings.monitoring_sample_threshold,
+                sample_rate=settings.monitoring_sample_rate
+            )
+            atexit.register(self._exporter.flush)
+        return self._exporter
 
     def initialize(self) -> None:
         """Initialize AgentOps with API key from settings."""
         if not self._initialized:
             try:
+                import agentops
                 agentops.init()
                 self._initialized = True
             except Exception as e:
-                print(f"Warning: Failed to initialize AgentOps: {e}")
+                logger.warning("monitoring_init_failed", error=str(e))
                 self._enabled = False
 
     @property
     def enabled(self) -> bool:
         """Check if monitoring is enabled."""
+        if self._enabled is None:
+            self._enabled = get_settings().monitoring_enabled
         return self._enabled
 
     @enabled.setter
@@ -39,67 +219,114 @@ class MonitoringConfig:
     @contextmanager
     def session(self, name: str, metadata: Optional[Dict[str, Any]] = None):
         """Context manager for AgentOps sessions."""
-        if not self._enabled:
+        if not self.enabled:
             yield None
             return
 
         try:
             self.initialize()
+            import agentops
             session = agentops.Session(
                 name=name,
                 metadata=metadata or {}
             )
             self._active_session = session
-            yield session
         except Exception as e:
-            print(f"Warning: Failed to create monitoring session: {e}")
-            yield None
+            logger.warning("monitoring_session_failed", error=str(e))
+            session = None
+        try:
+            yield session
         finally:
             self._active_session = None
 
     def track_agent(self, name: str) -> Callable:
-        """Decorator for tracking agent operations."""
+        """
+        Class decorator that registers each agent instance with AgentOps.
+
+        Registration is queued like any other event instead of calling
+        AgentOps from the constructor.
+        """
         def decorator(cls):
-            if not self._enabled:
-                return cls
+            original_init = cls.__init__
 
-            try:
-                return agentops.track_agent(name=name)(cls)
-            except Exception as e:
-                print(f"Warning: Failed to track agent {name}: {e}")
-                return cls
+            @wraps(original_init)
+            def __init__(instance, *args, **kwargs):
+                original_init(instance, *args, **kwargs)
+                instance.agentops_agent_id = str(uuid4())
+                instance.agentops_agent_name = name
+                if self.enabled:
+                    self.exporter.submit(
+                        "agent", {"name": name, "agent_id": instance.agentops_agent_id}, important=True)
+
+            cls.__init__ = __init__
+            return cls
         return decorator
 
     def record_action(self, action_name: str) -> Callable:
-        """Decorator for recording agent actions."""
+        """
+        Decorator for recording async agent actions.
+
+        The wrapped coroutine runs exactly once; its timing and outcome are
+        queued for export afterwards, and a failure while recording is
+        swallowed rather than retried.
+        """
         def decorator(func):
-            if not self._enabled:
-                return func
+            signature = inspect.signature(func)
 
             @wraps(func)
             async def wrapper(*args, **kwargs):
-                try:
-                    # Convert non-serializable objects to strings in kwargs
-                    serializable_kwargs = {
-                        k: str(v) if not isinstance(
-                            v, (str, int, float, bool, list, dict)) else v
-                        for k, v in kwargs.items()
-                    }
-
-                    with agentops.record_action(
-                        action_name,
-                        metadata=serializable_kwargs
-                    ):
-                        return await func(*args, **kwargs)
-                except Exception as e:
-                    print(
-                        f"Warning: Failed to record action {action_name}: {e}")
+                if not self.enabled:
                     return await func(*args, **kwargs)
+
+                started_at = _now()
+                start = time.perf_counter()
+                error = None
+                result = None
+                try:
+                    result = await func(*args, **kwargs)
+                    return result
+                except BaseException as e:
+                    error = e
+                    raise
+                finally:
+                    self._record(action_name, signature, args, kwargs, started_at,
+                                 time.perf_counter() - start, result, error)
             return wrapper
         return decorator
 
+    def _record(
+        self,
+        action_name: str,
+        signature: inspect.Signature,
+        args: tuple,
+        kwargs: dict,
+        started_at: str,
+        duration: float,
+        result: Any,
+        error: Optional[BaseException]
+    ) -> None:
+        try:
+            bound = signature.bind_partial(*args, **kwargs).arguments
+            instance = bound.pop("self", None)
+            self.exporter.submit(
+                "tool",
+                {
+                    "name": action_name,
+                    "agent_id": getattr(instance, "agentops_agent_id", None),
+                    "params": {k: _serializable(v) for k, v in bound.items()},
+                    "returns": None if error else _summarize(result),
+                    "error": repr(error) if error else None,
+                    "started_at": started_at,
+                    "ended_at": _now(),
+                    "duration_ms": round(duration * 1000, 2),
+                },
+                important=error is not None
+            )
+        except Exception as e:
+            logger.debug("monitoring_record_error", action=action_name, error=str(e))
+
     @property
-    def current_session(self) -> Optional[agentops.Session]:
+    def current_session(self) -> Optional["agentops.Session"]:
         """Get the current active session."""
         return self._active_session
 
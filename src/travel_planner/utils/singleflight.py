@@ -0,0 +1,81 @@
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one upstream request.
+
+    The first caller starts the work; later callers with the same key await
+    the same task until it finishes. The shared task is only cancelled once
+    every waiter has been cancelled.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, _Call] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        loop = asyncio.get_running_loop()
+        call = self._inflight.get(key)
+        if call is None or call.task.get_loop() is not loop:
+            call = _Call(loop.create_task(fn()))
+            self._inflight[key] = call
+            call.task.add_done_callback(lambda task, key=key, call=call: self._forget(key, call))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        if self._inflight.get(key) is call:
+            del self._inflight[key]
+        # Mark the exception as retrieved when every waiter has gone away
+        if not call.task.cancelled():
+            call.task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "inflight": len(self._inflight),
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+        }
+
+
+_groups: Dict[str, SingleFlight] = {}
+
+
+def single_flight(name: str) -> SingleFlight:
+    """Return the process-wide SingleFlight group for an upstream."""
+    if name not in _groups:
+        _groups[name] = SingleFlight(name)
+    return _groups[name]
+
+
+def request_key(payload: Any) -> str:
+    """Build a stable key from a JSON-serializable request payload."""
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
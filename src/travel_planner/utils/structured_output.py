@@ -0,0 +1,86 @@
+import json
+from functools import lru_cache
+from typing import Any, Callable, Dict, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from ..config import get_settings
+from .logger import logger
+
+T = TypeVar("T", bound=BaseModel)
+
+# Keywords OpenAI's strict mode rejects or that only cost prompt tokens; the
+# compact prompts state the units and formats instead of field descriptions
+_DROPPED_KEYWORDS = {"title", "description", "default", "minimum", "maximum"}
+
+
+def _strict(node: Any, defs: Dict[str, Any]) -> Any:
+    if isinstance(node, list):
+        return [_strict(item, defs) for item in node]
+    if not isinstance(node, dict):
+        return node
+    if "$ref" in node:
+        return _strict(defs[node["$ref"].rsplit("/", 1)[-1]], defs)
+
+    schema = {k: _strict(v, defs) for k, v in node.items() if k not in _DROPPED_KEYWORDS and k != "$defs"}
+    if schema.get("type") == "object":
+        # Strict mode needs every property listed as required and nothing extra
+        schema["required"] = list(schema.get("properties", {}))
+        schema["additionalProperties"] = False
+    return schema
+
+
+@lru_cache(maxsize=None)
+def strict_json_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Derive an OpenAI strict-mode JSON schema from a pydantic model.
+
+    References are inlined, every property is required, extra properties are
+    forbidden, and titles, descriptions, defaults and numeric bounds are
+    dropped to keep the schema, which is billed as prompt tokens, small.
+    """
+    schema = model.model_json_schema()
+    return _strict(schema, schema.get("$defs", {}))
+
+
+@lru_cache(maxsize=None)
+def response_format(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Return a `response_format` that constrains a completion to `model`."""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": model.__name__,
+            "strict": True,
+            "schema": strict_json_schema(model),
+        },
+    }
+
+
+def parse_structured(model: Type[T], content: str, fallback: Callable[[dict], T]) -> T:
+    """
+    Validate a structured completion in one pass with pydantic's JSON parser.
+
+    Values the schema cannot rule out (e.g. a rating above 5) fail
+    validation; those responses go through `fallback`, the lenient
+    per-item parsing used for plain JSON responses.
+    """
+    try:
+        return model.model_validate_json(content)
+    except ValidationError as e:
+        logger.warning("structured_output_invalid", model=model.__name__, errors=e.error_count())
+        return fallback(json.loads(content))
+
+
+def structured_request(model: Type[BaseModel], system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+    """Build a compact completion request whose answer must match `model`."""
+    settings = get_settings()
+    return dict(
+        model=settings.openai_model,
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ],
+        response_format=response_format(model),
+        max_tokens=settings.llm_max_tokens,
+        n=1
+    )
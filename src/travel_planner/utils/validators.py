@@ -1,41 +1,145 @@
-import requests
+import asyncio
+import random
 from typing import Tuple, Optional
+
+import httpx
+
+from ..config import get_settings
+from ..schemas.models import ResolvedCity
+from ..utils.cache import TTLCache
+from ..utils.circuit_breaker import CircuitOpenError, get_circuit_breaker, get_retry_budget
+from ..utils.exceptions import ServiceError
+from ..utils.http import get_http_client
 from ..utils.logger import logger
+from ..utils.metrics import get_metrics
+from ..utils.singleflight import single_flight
+
+_MISSING = object()
+_city_cache: Optional[TTLCache] = None
+
+
+def get_city_cache() -> TTLCache:
+    """Return the process-wide city resolution cache shared by all validators."""
+    global _city_cache
+    if _city_cache is None:
+        settings = get_settings()
+        _city_cache = TTLCache(
+            maxsize=settings.city_cache_size,
+            default_ttl=settings.city_cache_ttl
+        )
+    return _city_cache
+
+
+def normalize_city(city: str) -> str:
+    """Normalize a user-supplied city name into a cache key."""
+    return " ".join(city.split()).casefold()
+
 
 class CityValidator:
     def __init__(self, weather_api_key: str):
+        self.settings = get_settings()
         self.api_key = weather_api_key
-        self.base_url = "http://api.weatherapi.com/v1"
-        self.valid_cities_cache = {}  # Cache validation results
+        self.base_url = self.settings.weather_api_base_url
+        self.cache = get_city_cache()
 
     async def validate_city(self, city: str) -> Tuple[bool, Optional[str]]:
         """
         Validate if a city exists using WeatherAPI.
-        Returns (is_valid, error_message)
+        Returns (is_valid, canonical "Name, Country" or error message).
+        Raises ServiceError when WeatherAPI cannot answer, so an outage is
+        not reported as an invalid city.
         """
-        if city in self.valid_cities_cache:
-            return self.valid_cities_cache[city], None
-
         try:
-            # Use weather API to validate city
-            response = requests.get(
-                f"{self.base_url}/current.json",
-                params={
-                    "key": self.api_key,
-                    "q": city
-                }
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                validated_city = f"{data['location']['name']}, {data['location']['country']}"
-                self.valid_cities_cache[city] = True
-                return True, validated_city
-            else:
-                error_msg = f"Invalid city: {city}"
-                self.valid_cities_cache[city] = False
-                return False, error_msg
-
+            resolved = await self.resolve_city(city)
+        except ServiceError:
+            raise
+        except httpx.HTTPError as e:
+            raise ServiceError(f"Unable to reach weather service: {e}") from e
         except Exception as e:
             logger.error(f"City validation error: {str(e)}")
-            return False, f"Error validating city: {str(e)}"
\ No newline at end of file
+            return False, f"Error validating city: {str(e)}"
+
+        if resolved is None:
+            return False, f"Invalid city: {city}"
+        return True, resolved.canonical_name
+
+    async def resolve_city(self, city: str, max_age: Optional[float] = None) -> Optional[ResolvedCity]:
+        """
+        Resolve a city with a single WeatherAPI current.json call.
+
+        The response carries both the canonical location and current conditions,
+        so it is cached and reused by every agent. Returns None if no location
+        matches. Pass max_age to refetch when the cached conditions are older.
+        """
+        metrics = get_metrics()
+        key = normalize_city(city)
+        cached = self.cache.get(key, _MISSING)
+        if cached is not _MISSING:
+            if cached is None or max_age is None or cached.age_seconds <= max_age:
+                metrics.cache_lookup("city", hit=True)
+                return cached
+        metrics.cache_lookup("city", hit=False)
+
+        # Concurrent lookups of the same city share one WeatherAPI call
+        with metrics.timer("city_validation"):
+            try:
+                return await single_flight("weather").do(key, lambda: self._fetch(city, key))
+            except (ServiceError, httpx.HTTPError) as e:
+                # Conditions older than max_age beat no answer while WeatherAPI is down
+                if cached is _MISSING:
+                    raise
+                logger.warning("weather_serving_stale", city=city,
+                               age_seconds=round(cached.age_seconds), error=str(e))
+                metrics.inc("stale_served_total", upstream="weather")
+                return cached
+
+    async def _fetch(self, city: str, key: str) -> Optional[ResolvedCity]:
+        breaker = get_circuit_breaker("weather")
+        budget = get_retry_budget()
+        budget.record_request()
+        attempt = 0
+        while True:
+            response = None
+            try:
+                with breaker.guard():
+                    with get_metrics().timer("weather_api"):
+                        response = await get_http_client().get(
+                            f"{self.base_url}/current.json",
+                            params={
+                                "key": self.api_key,
+                                "q": city
+                            }
+                        )
+                    get_metrics().inc("upstream_responses_total", upstream="weather", status=response.status_code)
+
+                    # WeatherAPI answers 400 when no location matches; other
+                    # statuses (auth, quota, outages) must not be cached.
+                    if response.status_code not in (200, 400):
+                        raise ServiceError(
+                            f"Weather service error (Status: {response.status_code})")
+                break
+            except (ServiceError, httpx.TransportError) as e:
+                # Only outages and dropped connections are worth another try,
+                # and only while the shared retry budget allows it. A timeout
+                # has already used up the weather deadline, so retrying it
+                # would only add load to a slow upstream.
+                retryable = not isinstance(e, (CircuitOpenError, httpx.TimeoutException)) and (
+                    response is None or response.status_code >= 500)
+                if not retryable or attempt >= self.settings.weather_max_retries or not budget.try_spend():
+                    raise
+                attempt += 1
+                logger.warning("weather_retry", attempt=attempt, error=str(e))
+                await asyncio.sleep(random.uniform(0.05, 0.25))
+
+        if response.status_code == 400:
+            self.cache.set(key, None, ttl=self.settings.city_cache_negative_ttl)
+            return None
+
+        data = response.json()
+        resolved = ResolvedCity(
+            name=data["location"]["name"],
+            country=data["location"]["country"],
+            current=data.get("current", {})
+        )
+        self.cache.set(key, resolved)
+        return resolved
@@ -0,0 +1,193 @@
+import asyncio
+import csv
+import json
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from .agents.travel_planner_agent import TravelPlannerAgent
+from .config import get_settings
+from .schemas.models import TravelPlan
+from .utils.cache import TTLCache
+from .utils.logger import logger
+from .utils.validators import normalize_city
+
+RouteKey = Tuple[str, str, str]
+
+
+@dataclass(frozen=True)
+class Route:
+    """A popular origin/destination pair, planned `days_ahead` days from today."""
+    origin: str
+    destination: str
+    days_ahead: int = 7
+
+    def date(self) -> str:
+        return (datetime.now() + timedelta(days=self.days_ahead)).strftime("%Y-%m-%d")
+
+
+@dataclass
+class _Entry:
+    plan: TravelPlan
+    fresh_until: float
+    refresh_at: float
+
+
+def load_routes(path: str) -> List[Route]:
+    """Read routes from a CSV (origin,destination[,days_ahead] header) or JSONL file."""
+    with open(path, newline="", encoding="utf-8") as stream:
+        if Path(path).suffix.lower() == ".csv":
+            rows = list(csv.DictReader(stream))
+        else:
+            rows = [json.loads(line) for line in stream if line.strip()]
+    return [
+        Route(
+            origin=row["origin"].strip(),
+            destination=row["destination"].strip(),
+            days_ahead=int(row.get("days_ahead") or 7)
+        )
+        for row in rows
+    ]
+
+
+def _route_key(origin: str, destination: str, date: str) -> RouteKey:
+    return normalize_city(origin), normalize_city(destination), date
+
+
+class RouteWarmer:
+    """
+    Keep travel plans for a fixed list of popular routes warm.
+
+    A background task refreshes each route shortly before its plan goes
+    stale, with random jitter so refreshes do not all fire together. Plans
+    past their TTL are still served (stale-while-revalidate) while a refresh
+    runs in the background. Requests for routes outside the list go straight
+    to the planner.
+    """
+
+    def __init__(
+        self,
+        travel_planner: TravelPlannerAgent,
+        routes: List[Route],
+        ttl: Optional[float] = None,
+        stale_ttl: Optional[float] = None
+    ):
+        settings = get_settings()
+        self.travel_planner = travel_planner
+        self.routes = routes
+        self.ttl = settings.warm_ttl if ttl is None else ttl
+        self.stale_ttl = settings.warm_stale_ttl if stale_ttl is None else stale_ttl
+        self.refresh_ahead = settings.warm_refresh_ahead
+        self.jitter = settings.warm_jitter
+        self.check_interval = settings.warm_check_interval
+        self.cache = TTLCache(
+            maxsize=max(len(routes), 1) * 2,
+            default_ttl=self.ttl + self.stale_ttl
+        )
+        self._slots = asyncio.Semaphore(settings.warm_concurrency)
+        self._refreshing: Set[RouteKey] = set()
+        self._background: Set[asyncio.Task] = set()
+        self._loop_task: Optional[asyncio.Task] = None
+        self.counters = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "refresh_errors": 0}
+
+    def _current_routes(self) -> Dict[RouteKey, Route]:
+        routes = {}
+        for route in self.routes:
+            routes[_route_key(route.origin, route.destination, route.date())] = route
+        return routes
+
+    def _store(self, key: RouteKey, plan: TravelPlan) -> None:
+        now = time.monotonic()
+        # Refresh ahead of expiry, spread out by jitter so routes do not stampede
+        refresh_at = now + self.ttl * (1 - self.refresh_ahead) - random.uniform(0, self.jitter * self.ttl)
+        self.cache.set(key, _Entry(plan=plan, fresh_until=now + self.ttl, refresh_at=refresh_at))
+
+    async def _refresh(self, key: RouteKey, origin: str, destination: str, date: str) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        try:
+            async with self._slots:
+                plan = await self.travel_planner.execute(origin, destination, date)
+            # Only cache complete plans; a failed service should be retried, not served
+            if all(status.status for status in plan.service_status.values()):
+                self._store(key, plan)
+                self.counters["refreshes"] += 1
+            else:
+                self.counters["refresh_errors"] += 1
+        except Exception as e:
+            self.counters["refresh_errors"] += 1
+            logger.warning("route_refresh_error", origin=origin, destination=destination, error=str(e))
+        finally:
+            self._refreshing.discard(key)
+
+    def _refresh_in_background(self, key: RouteKey, origin: str, destination: str, date: str) -> None:
+        if key in self._refreshing:
+            return
+        task = asyncio.ensure_future(self._refresh(key, origin, destination, date))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def plan(self, origin: str, destination: str, date: str) -> TravelPlan:
+        """Return a plan, from the warm cache when the route is on the list."""
+        key = _route_key(origin, destination, date)
+        entry = self.cache.get(key)
+        if entry is not None:
+            if time.monotonic() < entry.fresh_until:
+                self.counters["hits"] += 1
+            else:
+                self.counters["stale_hits"] += 1
+                self._refresh_in_background(key, origin, destination, date)
+            return entry.plan
+
+        self.counters["misses"] += 1
+        plan = await self.travel_planner.execute(origin, destination, date)
+        if key in self._current_routes() and all(s.status for s in plan.service_status.values()):
+            self._store(key, plan)
+        return plan
+
+    async def refresh_due(self) -> int:
+        """Refresh every route that is missing or due for refresh; returns how many were started."""
+        now = time.monotonic()
+        started = 0
+        for key, route in self._current_routes().items():
+            entry = self.cache.get(key)
+            if entry is None or now >= entry.refresh_at:
+                self._refresh_in_background(key, route.origin, route.destination, key[2])
+                started += 1
+        return started
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh_due()
+            except Exception as e:
+                logger.error("route_warmer_error", error=str(e))
+            await asyncio.sleep(self.check_interval)
+
+    def start(self) -> None:
+        """Start the background refresher on the running event loop."""
+        if self._loop_task is None:
+            logger.info("route_warmer_started", routes=len(self.routes))
+            self._loop_task = asyncio.ensure_future(self._run())
+
+    async def stop(self) -> None:
+        """Stop the refresher and cancel refreshes still in flight."""
+        tasks = list(self._background)
+        if self._loop_task is not None:
+            tasks.append(self._loop_task)
+            self._loop_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            **self.counters,
+            "routes": len(self.routes),
+            "cached": len(self.cache),
+            "refreshing": len(self._refreshing),
+        }
@@ -1,4 +1,3 @@
-import asyncio
 import json
 import os
 import sys
@@ -15,11 +14,9 @@ import streamlit as st
 src_path = Path(__file__).parent.parent / "src"
 sys.path.append(str(src_path))
 
-from travel_planner.agents.flight_agent import FlightAgent
-from travel_planner.agents.hotel_agent import HotelAgent
-from travel_planner.agents.travel_planner_agent import TravelPlannerAgent
-from travel_planner.agents.weather_agent import WeatherAgent
 from travel_planner.config import get_settings
+from travel_planner.runtime import PlannerRuntime
+from travel_planner.schemas.models import PlanCompleted
 from travel_planner.utils.exceptions import (CityValidationError, ServiceError,
                                              WeatherServiceError)
 
@@ -60,18 +57,16 @@ def init_session_state():
         st.session_state.last_search = None
 
 
+@st.cache_resource(show_spinner="Starting travel planning agents...")
+def get_runtime():
+    """Build the agents, clients and event loop once per process and share them across reruns."""
+    return PlannerRuntime()
+
+
 def initialize_agents():
-    """Initialize travel planning agents."""
+    """Return the shared travel planning runtime."""
     try:
-        weather_agent = WeatherAgent()
-        flight_agent = FlightAgent()
-        hotel_agent = HotelAgent()
-        travel_planner = TravelPlannerAgent(
-            weather_agent=weather_agent,
-            flight_agent=flight_agent,
-            hotel_agent=hotel_agent
-        )
-        return travel_planner
+        return get_runtime()
     except Exception as e:
         st.error(f"Failed to initialize agents: {str(e)}")
         return None
@@ -200,33 +195,125 @@ def show_search_history():
                 )
 
 
-async def get_travel_plan(travel_planner, origin, destination, date):
-    """Get travel plan with error handling."""
-    try:
-        with st.spinner('Getting travel information...'):
-            plan = await travel_planner.execute(
-                origin=origin,
-                destination=destination,
-                date=date
+def render_weather(status, weather_forecast, destination):
+    """Render the weather tab for one service update."""
+    if status.status:
+        st.subheader(f"🌤️ Weather in {destination}")
+        format_weather_card(weather_forecast)
+    elif status.error:
+        show_error_message(status.error, "weather")
+    else:
+        st.error("Weather service is temorarily unavailable")
+
+
+def render_flights(status, flight_options, origin, destination):
+    """Render the flights tab for one service update."""
+    if status.status:
+        st.subheader("✈️ Flight Options")
+        if flight_options:
+            # Price filter for flights
+            max_price = max(f.price for f in flight_options)
+            price_filter = st.slider(
+                "Filter by maximum flight price ($)",
+                min_value=0,
+                max_value=int(max_price),
+                value=int(max_price)
             )
-            # Handle empty plan case
-            if not plan:
-                st.warning(
-                    "Unable to get travel information. Please try again.")
-                return None
-
-            # Check if any service has validation errors
-            validation_errors = [
-                (service, status.error)
-                for service, status in plan.service_status.items()
-                if status.error and "not a valid city" in status.error
+
+            filtered_flights = [
+                f for f in flight_options if f.price <= price_filter]
+            if filtered_flights:
+                for flight in filtered_flights:
+                    format_flight_card(flight)
+            else:
+                st.info("No flights found within the selected price range")
+        else:
+            st.info(f"No flights found between {origin} and {destination}")
+    elif status.error:
+        if "Invalid city" in status.error:
+            st.error(f"❌ {status.error}")
+        else:
+            st.error("⚠️ Flight information is temporarily unavailable")
+            st.info(f"Details: {status.error}")
+    else:
+        st.error("Flight service is unavailable")
+
+
+def render_hotels(status, hotel_options, destination):
+    """Render the hotels tab for one service update."""
+    if status.status:
+        st.subheader("🏨 Hotel Options")
+        if hotel_options:
+            col1, col2 = st.columns(2)
+            with col1:
+                max_hotel_price = max(h.price_per_night for h in hotel_options)
+                price_filter = st.slider(
+                    "Filter by maximum price per night ($)",
+                    min_value=0,
+                    max_value=int(max_hotel_price),
+                    value=int(max_hotel_price)
+                )
+            with col2:
+                min_rating = st.select_slider(
+                    "Minimum Rating",
+                    options=[1, 2, 3, 4, 5],
+                    value=1
+                )
+
+            filtered_hotels = [
+                h for h in hotel_options
+                if h.price_per_night <= price_filter and h.rating >= min_rating
             ]
 
-            if validation_errors:
-                for service, error in validation_errors:
-                    show_error_message(error, service)
-                return None
-            return plan
+            if filtered_hotels:
+                for hotel in filtered_hotels:
+                    format_hotel_card(hotel)
+            else:
+                st.info("No hotels found matching your criteria")
+        else:
+            st.info(f"No hotels found in {destination}")
+    elif status.error:
+        if "Invalid city" in status.error:
+            st.error(f"❌ {status.error}")
+        else:
+            st.error("⚠️ Hotel information is temporarily unavailable")
+            st.info(f"Details: {status.error}")
+    else:
+        st.error("Hotel service is unavailable")
+
+
+def render_update(update, placeholders, origin, destination):
+    """Draw a finished service into its tab while the others keep loading."""
+    with placeholders[update.service].container():
+        if update.service == "weather":
+            render_weather(update.status, update.weather_forecast, destination)
+        elif update.service == "flights":
+            render_flights(update.status, update.flight_options, origin, destination)
+        else:
+            render_hotels(update.status, update.hotel_options, destination)
+
+
+def get_travel_plan(runtime, origin, destination, date, placeholders):
+    """Stream the travel plan into the result tabs, with error handling."""
+    try:
+        plan = None
+        for event in runtime.iter_plan(origin, destination, date):
+            if isinstance(event, PlanCompleted):
+                plan = event.plan
+            elif not event.partial:
+                render_update(event, placeholders, origin, destination)
+
+        # Handle empty plan case
+        if not plan:
+            st.warning(
+                "Unable to get travel information. Please try again.")
+            return None
+
+        # Invalid cities were already reported in their tabs
+        if any(status.error and "not a valid city" in status.error
+               for status in plan.service_status.values()):
+            return None
+        return plan
 
     except Exception as e:
         st.error("Unable to process your request")
@@ -290,14 +377,25 @@ def main():
 
     if st.button("🔍 Search Travel Options", type="primary"):
         agentops.start_session(tags=["Travel agent", "Streamlit"])
-        travel_planner = initialize_agents()
-        if travel_planner:
-            plan = asyncio.run(get_travel_plan(
-                travel_planner,
+        runtime = initialize_agents()
+        if runtime:
+            # Each tab fills in as soon as its service finishes
+            tab1, tab2, tab3 = st.tabs(["Weather", "Flights", "Hotels"])
+            placeholders = {
+                "weather": tab1.empty(),
+                "flights": tab2.empty(),
+                "hotels": tab3.empty()
+            }
+            for service, placeholder in placeholders.items():
+                placeholder.info(f"⏳ Getting {service} information...")
+
+            plan = get_travel_plan(
+                runtime,
                 origin,
                 destination,
-                date.strftime("%Y-%m-%d")
-            ))
+                date.strftime("%Y-%m-%d"),
+                placeholders
+            )
 
             if plan:
                 # Add to search history
@@ -309,104 +407,6 @@ def main():
                 })
                 st.session_state.last_search = plan
 
-                # Display results in tabs
-                tab1, tab2, tab3 = st.tabs(["Weather", "Flights", "Hotels"])
-
-                with tab1:
-                    weather_status = plan.service_status["weather"]
-                    if weather_status.status:  # Access as property, not dict
-                        st.subheader(f"🌤️ Weather in {destination}")
-                        format_weather_card(plan.weather_forecast)
-                    else:
-                        if weather_status.error:  # Access as property
-                            show_error_message(weather_status.error, "weather")
-                        else:
-                            st.error(
-                                "Weather service is temorarily unavailable")
-
-                with tab2:
-                    flight_status = plan.service_status["flights"]
-                    if flight_status.status:  # Access as property
-                        st.subheader("✈️ Flight Options")
-                        if plan.flight_options:
-                            # Price filter for flights
-                            max_price = max(
-                                f.price for f in plan.flight_options)
-                            price_filter = st.slider(
-                                "Filter by maximum flight price ($)",
-                                min_value=0,
-                                max_value=int(max_price),
-                                value=int(max_price)
-                            )
-
-                            filtered_flights = [
-                                f for f in plan.flight_options if f.price <= price_filter]
-                            if filtered_flights:
-                                for flight in filtered_flights:
-                                    format_flight_card(flight)
-                            else:
-                                st.info(
-                                    "No flights found within the selected price range")
-                        else:
-                            st.info(
-                                f"No flights found between {origin} and {destination}")
-                    else:
-                        if flight_status.error:  # Access as property
-                            if "Invalid city" in flight_status.error:
-                                st.error(f"❌ {flight_status.error}")
-                            else:
-                                st.error(
-                                    "⚠️ Flight information is temporarily unavailable")
-                                st.info(f"Details: {flight_status.error}")
-                        else:
-                            st.error("Flight service is unavailable")
-
-                with tab3:
-                    hotel_status = plan.service_status["hotels"]
-                    if hotel_status.status:  # Access as property
-                        st.subheader("🏨 Hotel Options")
-                        if plan.hotel_options:
-                            col1, col2 = st.columns(2)
-                            with col1:
-                                max_hotel_price = max(
-                                    h.price_per_night for h in plan.hotel_options)
-                                price_filter = st.slider(
-                                    "Filter by maximum price per night ($)",
-                                    min_value=0,
-                                    max_value=int(max_hotel_price),
-                                    value=int(max_hotel_price)
-                                )
-                            with col2:
-                                min_rating = st.select_slider(
-                                    "Minimum Rating",
-                                    options=[1, 2, 3, 4, 5],
-                                    value=1
-                                )
-
-                            filtered_hotels = [
-                                h for h in plan.hotel_options
-                                if h.price_per_night <= price_filter and h.rating >= min_rating
-                            ]
-
-                            if filtered_hotels:
-                                for hotel in filtered_hotels:
-                                    format_hotel_card(hotel)
-                            else:
-                                st.info(
-                                    "No hotels found matching your criteria")
-                        else:
-                            st.info(f"No hotels found in {destination}")
-                    else:
-                        if hotel_status.error:  # Access as property
-                            if "Invalid city" in hotel_status.error:
-                                st.error(f"❌ {hotel_status.error}")
-                            else:
-                                st.error(
-                                    "⚠️ Hotel information is temporarily unavailable")
-                                st.info(f"Details: {hotel_status.error}")
-                        else:
-                            st.error("Hotel service is unavailable")
-
                 # Show overall status for failed services
                 failed_services = [
                     service for service, status in plan.service_status.items()
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Make the package importable without installation, as benchmarks/fakes.py does
+sys.path.append(str(Path(__file__).parent.parent / "src"))
@@ -0,0 +1,34 @@
+from travel_planner.utils.json_stream import JSONArrayStreamParser
+
+RESPONSE = '{"flights": [{"price": 289.0, "stops": 0}, {"price": 214.5, "stops": 1}]}'
+
+
+def feed_all(parser, text, chunk_size=7):
+    items = []
+    for i in range(0, len(text), chunk_size):
+        items.extend(parser.feed(text[i:i + chunk_size]))
+    return items
+
+
+def test_complete_array():
+    parser = JSONArrayStreamParser("flights")
+    assert feed_all(parser, RESPONSE) == [{"price": 289.0, "stops": 0}, {"price": 214.5, "stops": 1}]
+    assert parser.done
+
+
+def test_truncated_response_is_not_done():
+    parser = JSONArrayStreamParser("flights")
+    assert feed_all(parser, RESPONSE[:60]) == [{"price": 289.0, "stops": 0}]
+    assert not parser.done
+
+
+def test_wrong_key_is_not_done():
+    parser = JSONArrayStreamParser("flights")
+    assert feed_all(parser, RESPONSE.replace('"flights"', '"flight_options"')) == []
+    assert not parser.done
+
+
+def test_plain_text_is_not_done():
+    parser = JSONArrayStreamParser("flights")
+    assert feed_all(parser, "Sorry, I can't help with flight searches.") == []
+    assert not parser.done